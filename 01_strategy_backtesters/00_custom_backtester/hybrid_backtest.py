@@ -3,85 +3,199 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
-def run_hybrid_backtest(ticker="KRW-BTC", initial_capital=1000000, fee_rate=0.0005):
+from tr_machine.checkpoint import load_checkpoint, save_checkpoint
+from tr_machine.indicators import sma
+from tr_machine.ohlcv import bar_arrays, find_bar, slice_bars
+
+SHORT_WINDOW = 15 # 장기 필터 단기 MA (일봉)
+LONG_WINDOW = 80  # 장기 필터 장기 MA (일봉)
+K = 0.5           # 변동성 돌파 k값
+
+def _init_state(bars_daily, bars_4h, initial_capital):
+    return {
+        'position': 'cash',   # cash, holding
+        'capital': initial_capital,
+        'entry_price': None,  # 보유 중일 때의 진입가
+        'prev_target': np.nan,
+        'prev_high': np.nan,
+        'prev_low': np.nan,
+        'regime': None,       # 마지막으로 반영된 일봉의 장기 추세 (GC/DC)
+        'daily_buffer': np.empty(0),  # 일봉 MA 계산용 직전 종가
+        'first_daily_time': bars_daily['time'][0],  # 데이터 시작 시각 (시작점이 바뀌면 이어서 계산하지 않음)
+        'first_time': bars_4h['time'][0],
+        'last_daily_time': None,
+        'last_time': None,
+        'last_close': None,
+        'peak': None,
+        'mdd': 0.0,
+        'first_close': None,
+    }
+
+def _extend(state, new_4h, new_daily, fee_rate):
+    """
+    state에 새 4시간봉(new_4h)과 그 구간까지의 새 일봉(new_daily)을 이어서 모의 투자를 진행하고
+    4시간봉별 실현 자본(마지막 보유분 정산 전), 종가 기준 평가 자산, 보유 여부를 반환합니다.
+    """
+    # 장기 추세 필터 (일봉): 직전 종가 버퍼와 새 종가만으로 MA 계산
+    closes = np.concatenate([state['daily_buffer'], new_daily['close']])
+    offset = len(state['daily_buffer'])
+    short_ma = sma(closes, SHORT_WINDOW)[offset:]
+    long_ma = sma(closes, LONG_WINDOW)[offset:]
+    daily_regime = np.where(short_ma > long_ma, 'GC', 'DC')
+    daily_pos = np.searchsorted(new_daily['time'], new_4h['time'], side='right') - 1
+
+    opens, highs, lows, closes_4h = new_4h['open'], new_4h['high'], new_4h['low'], new_4h['close']
+    capitals = np.empty(len(opens))
+    equities = np.empty(len(opens))
+    positions = np.empty(len(opens), dtype=np.int8)
+
+    for i in range(len(opens)):
+        regime = daily_regime[daily_pos[i]] if daily_pos[i] >= 0 else state['regime']
+        # 단기 진입 신호 (4시간봉): 직전 캔들 변동폭 기준 목표가
+        target = opens[i] + (state['prev_high'] - state['prev_low']) * K
+
+        if state['last_time'] is not None:
+            # 매수 조건: (골든크로스 상태) AND (목표가 돌파) AND (현금 보유)
+            if regime == 'GC' and highs[i] > target and state['position'] == 'cash':
+                state['position'] = 'holding'
+                state['entry_price'] = state['prev_target']
+                # 매수 시점의 자본 변화는 매도 시점에 정산 (수수료 계산 간소화)
+
+            # 매도 조건: (데드크로스 상태) AND (자산 보유)
+            elif regime == 'DC' and state['position'] == 'holding':
+                state['position'] = 'cash'
+                profit = (opens[i] / state['entry_price']) * (1 - fee_rate)**2
+                state['capital'] *= profit
+                state['entry_price'] = None
+
+        state['regime'] = regime
+        state['prev_target'] = target
+        state['prev_high'], state['prev_low'] = highs[i], lows[i]
+        state['last_time'] = new_4h['time'][i]
+        capitals[i] = state['capital']
+        positions[i] = 1 if state['position'] == 'holding' else 0
+        # 보유 중에는 마지막 보유분 정산과 같은 방식으로 종가 기준 평가
+        if state['position'] == 'holding':
+            equities[i] = state['capital'] * (closes_4h[i] / state['entry_price'])
+        else:
+            equities[i] = state['capital']
+
+    if len(opens):
+        state['last_close'] = closes_4h[-1]
+        if state['first_close'] is None:
+            state['first_close'] = closes_4h[0]
+    if len(new_daily['time']):
+        # 일봉이 LONG_WINDOW - 1개보다 적으면 전부 유지
+        state['daily_buffer'] = closes[-(LONG_WINDOW - 1):]
+        state['last_daily_time'] = new_daily['time'][-1]
+    return capitals, equities, positions
+
+def _update_drawdown(state, cumulative_returns):
+    for value in cumulative_returns:
+        state['peak'] = value if state['peak'] is None else max(state['peak'], value)
+        state['mdd'] = min(state['mdd'], (value - state['peak']) / state['peak'])
+
+def _resume(checkpoint, bars_daily, bars_4h):
+    """
+    체크포인트 이후 새 일봉/4시간봉이 시작하는 위치를 반환합니다.
+    데이터의 첫 일봉/4시간봉이 체크포인트와 다르거나(예: API의 최근 N개 구간이 밀린 경우),
+    체크포인트의 마지막 캔들이 데이터에 없거나 종가가 다르면 None을 반환합니다.
+    """
+    state = checkpoint['state']
+    if (state.get('first_daily_time') != bars_daily['time'][0]
+            or state.get('first_time') != bars_4h['time'][0]):
+        return None
+    i = find_bar(bars_4h['time'], state['last_time'])
+    if i is None or bars_4h['close'][i] != state['last_close']:
+        return None
+    if state['last_daily_time'] is None:
+        return 0, i + 1
+    j = find_bar(bars_daily['time'], state['last_daily_time'])
+    if j is None or bars_daily['close'][j] != state['daily_buffer'][-1]:
+        return None
+    return j + 1, i + 1
+
+def run_hybrid_backtest(ticker="KRW-BTC", initial_capital=1000000, fee_rate=0.0005, data_daily=None, data_4h=None, checkpoint=None):
     """
     골든크로스(장기 필터)와 변동성 돌파(단기 신호)를 결합한 하이브리드 전략 백테스팅.
+    data_daily/data_4h에 DataFrame 또는 OHLCV를 넘기면 API 대신 해당 데이터를 사용합니다.
+    OHLCV는 DataFrame으로 바꾸지 않고 가격 배열을 그대로 사용합니다.
+    checkpoint에 파일 경로를 넘기면 저장된 상태에서 이어서 새 캔들만 계산합니다.
+    진행 중일 수 있는 마지막 일봉/4시간봉 구간은 체크포인트에 저장하지 않습니다.
     """
     print("🚀 하이브리드 전략 백테스팅 시작...")
-    print("장기 필터: 15/80일 MA (일봉) | 단기 신호: 변동성 돌파 k=0.5 (4시간봉)")
+    print(f"장기 필터: {SHORT_WINDOW}/{LONG_WINDOW}일 MA (일봉) | 단기 신호: 변동성 돌파 k={K} (4시간봉)")
 
     # 1. 데이터 준비 (일봉 & 4시간봉)
-    df_daily = pyupbit.get_ohlcv(ticker, interval="day", count=500)
-    df_4h = pyupbit.get_ohlcv(ticker, interval="minute240", count=500*6)
-    if df_daily is None or df_4h is None:
+    if data_daily is None:
+        data_daily = pyupbit.get_ohlcv(ticker, interval="day", count=500)
+    if data_4h is None:
+        data_4h = pyupbit.get_ohlcv(ticker, interval="minute240", count=500*6)
+    if data_daily is None or data_4h is None:
         print("❌ 데이터 로드 실패")
         return
+    bars_daily = bar_arrays(data_daily, columns=('close',))
+    bars_4h = bar_arrays(data_4h)
+
+    # 2. 체크포인트 확인
+    params = {'ticker': ticker, 'initial_capital': initial_capital, 'fee_rate': fee_rate,
+              'short_window': SHORT_WINDOW, 'long_window': LONG_WINDOW, 'k': K}
+    saved = load_checkpoint(checkpoint, 'hybrid', params) if checkpoint else None
+    # 평가 자산(equity)이 없는 이전 형식의 체크포인트는 처음부터 다시 계산
+    resumed = _resume(saved, bars_daily, bars_4h) if saved and 'equity' in saved['curve'] else None
+    if resumed is not None:
+        new_daily, new_4h = slice_bars(bars_daily, resumed[0]), slice_bars(bars_4h, resumed[1])
+        state, curve = saved['state'], saved['curve']
+        print(f"♻️  체크포인트에서 이어서 계산합니다. (새 4시간봉 {len(new_4h['time'])}개)")
+    else:
+        new_daily, new_4h = bars_daily, bars_4h
+        state = _init_state(bars_daily, bars_4h, initial_capital)
+        curve = {'time': bars_4h['time'][:0], 'capital': np.empty(0), 'equity': np.empty(0),
+                 'position': np.empty(0, dtype=np.int8), 'close': np.empty(0)}
 
-    # 2. 장기 추세 필터 계산 (일봉 기준)
-    df_daily['short_ma'] = df_daily['close'].rolling(window=15).mean()
-    df_daily['long_ma'] = df_daily['close'].rolling(window=80).mean()
-    df_daily['regime'] = np.where(df_daily['short_ma'] > df_daily['long_ma'], 'GC', 'DC')
-    
-    # 4시간봉 데이터에 장기 추세 정보 결합
-    regime_series = df_daily['regime'].reindex(df_4h.index, method='ffill')
-    df_4h['regime'] = regime_series
-
-    # 3. 단기 진입/청산 신호 계산 (4시간봉 기준)
-    k = 0.5 # 변동성 돌파 k값
-    df_4h['range'] = (df_4h['high'] - df_4h['low']).shift(1)
-    df_4h['target'] = df_4h['open'] + df_4h['range'] * k
-    
-    # 4. 모의 투자 실행
-    df_4h['position'] = 'cash'  # cash, holding
-    df_4h['capital'] = initial_capital
-
-    for i in range(1, len(df_4h)):
-        # 이전 상태를 기본으로 설정
-        df_4h.loc[df_4h.index[i], 'position'] = df_4h.loc[df_4h.index[i-1], 'position']
-        df_4h.loc[df_4h.index[i], 'capital'] = df_4h.loc[df_4h.index[i-1], 'capital']
-
-        # 현재 상태 변수
-        current_regime = df_4h.loc[df_4h.index[i], 'regime']
-        current_high = df_4h.loc[df_4h.index[i], 'high']
-        target_price = df_4h.loc[df_4h.index[i], 'target']
-        current_position = df_4h.loc[df_4h.index[i], 'position']
-        
-        # 매수 조건: (골든크로스 상태) AND (목표가 돌파) AND (현금 보유)
-        if current_regime == 'GC' and current_high > target_price and current_position == 'cash':
-            df_4h.loc[df_4h.index[i], 'position'] = 'holding'
-            # 매수 시점의 자본 변화는 매도 시점에 정산 (수수료 계산 간소화)
-
-        # 매도 조건: (데드크로스 상태) AND (자산 보유)
-        elif current_regime == 'DC' and current_position == 'holding':
-            df_4h.loc[df_4h.index[i], 'position'] = 'cash'
-            
-            # 수익률 계산
-            entry_row = df_4h[df_4h.index < df_4h.index[i]].query("position == 'cash'").index[-1]
-            entry_price = df_4h.loc[entry_row, 'target']
-            exit_price = df_4h.loc[df_4h.index[i], 'open']
-            
-            profit = (exit_price / entry_price) * (1 - fee_rate)**2
-            df_4h.loc[df_4h.index[i], 'capital'] *= profit
+    # 3. 모의 투자 실행 (진행 중인 마지막 일봉/4시간봉 이전까지 계산 후 체크포인트 저장)
+    commit_time = min(bars_daily['time'][-1], bars_4h['time'][-1])
+    n_committed = np.searchsorted(new_4h['time'], commit_time)
+    committed_4h, last_4h = slice_bars(new_4h, None, n_committed), slice_bars(new_4h, n_committed)
+    if n_committed:
+        n_daily = np.searchsorted(new_daily['time'], committed_4h['time'][-1], side='right')
+    else:
+        n_daily = 0
+    committed_daily, last_daily = slice_bars(new_daily, None, n_daily), slice_bars(new_daily, n_daily)
+
+    capitals, equities, positions = _extend(state, committed_4h, committed_daily, fee_rate)
+    _update_drawdown(state, capitals / initial_capital)
+    curve = {
+        'time': np.concatenate([np.asarray(curve['time'], dtype='datetime64[ns]'), committed_4h['time']]),
+        'capital': np.concatenate([curve['capital'], capitals]),
+        'equity': np.concatenate([curve['equity'], equities]),
+        'position': np.concatenate([curve['position'], positions]),
+        'close': np.concatenate([curve['close'], committed_4h['close']]),
+    }
+    if checkpoint:
+        save_checkpoint(checkpoint, 'hybrid', params, state, curve)
+
+    last_capitals, last_equities, last_positions = _extend(state, last_4h, last_daily, fee_rate)
+    times = pd.DatetimeIndex(np.concatenate([curve['time'], last_4h['time']]))
+    capitals = np.concatenate([curve['capital'], last_capitals])
+    equities = np.concatenate([curve['equity'], last_equities])
+    positions = np.concatenate([curve['position'], last_positions])
+    closes = np.concatenate([curve['close'], last_4h['close']])
 
     # 최종 수익률 계산 (마지막까지 보유중인 경우)
-    if df_4h['position'].iloc[-1] == 'holding':
-        entry_row = df_4h.query("position == 'cash'").index[-1]
-        entry_price = df_4h.loc[entry_row, 'target']
-        exit_price = df_4h['close'].iloc[-1]
-        profit = (exit_price / entry_price)
-        df_4h.loc[df_4h.index[-1], 'capital'] *= profit
-
-    df_4h['cumulative_return'] = df_4h['capital'] / initial_capital
-    
-    # 5. 성과 분석
-    final_capital = df_4h['capital'].iloc[-1]
+    if state['position'] == 'holding':
+        profit = (closes[-1] / state['entry_price'])
+        capitals[-1] *= profit
+
+    cumulative_return = capitals / initial_capital
+    _update_drawdown(state, cumulative_return[len(curve['capital']):])
+
+    # 4. 성과 분석
+    final_capital = capitals[-1]
     total_return = (final_capital / initial_capital) - 1
-    
-    df_4h['peak'] = df_4h['cumulative_return'].cummax()
-    drawdown = (df_4h['cumulative_return'] - df_4h['peak']) / df_4h['peak']
-    mdd = drawdown.min()
+    mdd = state['mdd']
 
-    buy_and_hold_return = (df_4h['close'].iloc[-1] / df_4h['close'].iloc[0]) - 1
+    buy_and_hold_return = (closes[-1] / state['first_close']) - 1
 
     print("\n✅ 백테스팅 완료!")
     print("---------------------------------")
@@ -91,15 +205,24 @@ def run_hybrid_backtest(ticker="KRW-BTC", initial_capital=1000000, fee_rate=0.00
     print(f"최대 낙폭 (MDD): {mdd*100:.2f}%")
     print("---------------------------------")
 
-    # 6. 시각화
+    # 5. 시각화
     plt.figure(figsize=(14, 7))
-    plt.plot(df_4h.index, df_4h['cumulative_return'], label="Hybrid Strategy")
-    plt.plot(df_4h.index, df_4h['close'] / df_4h['close'].iloc[0], label="Buy and Hold")
+    plt.plot(times, cumulative_return, label="Hybrid Strategy")
+    plt.plot(times, closes / closes[0], label="Buy and Hold")
     plt.title('Hybrid Strategy Performance (GC Filter + VB Signal)')
     plt.legend()
     plt.grid()
     plt.savefig('hybrid_backtest_result.png')
     print("📈 백테스팅 결과가 'hybrid_backtest_result.png' 파일로 저장되었습니다.")
 
+    return {
+        "final_capital": final_capital,
+        "total_return_pct": total_return * 100,
+        "buy_and_hold_pct": buy_and_hold_return * 100,
+        "mdd_pct": mdd * 100,
+        "equity": pd.Series(equities, index=times),  # 보유 중 종가 기준 평가 자산
+        "position": pd.Series(positions, index=times),
+    }
+
 if __name__ == '__main__':
     run_hybrid_backtest()
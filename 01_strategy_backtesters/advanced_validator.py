@@ -22,6 +22,7 @@ class GcRsiStrategy(Strategy):
     long_ma_period = 80
     rsi_period = 14
     rsi_oversold_threshold = 30
+    order_size = 0.95  # 매수 시 사용할 자산 비율
 
     def init(self):
         # 지표 계산
@@ -36,12 +37,21 @@ class GcRsiStrategy(Strategy):
         
         # 매수 조건: (골든크로스 상태) AND (RSI 과매도) AND (미보유)
         if is_gc_regime and is_rsi_oversold and not self.position:
-            self.buy(size=0.95)
+            self.buy(size=self.order_size)
 
         # 매도 조건: 데드크로스 발생 시 전량 매도
         if crossover(self.long_ma, self.short_ma) and self.position:
             self.position.close()
 
+    def signals(self):
+        # next()와 같은 규칙을 배열로 표현 (tr_machine.vectorized 빠른 스크리닝용)
+        # tr_machine.vectorized에서만 호출되므로 스크립트 단독 실행에는 tr_machine이 필요 없음
+        from tr_machine.vectorized import crossover as crossover_array
+
+        entries = (self.short_ma > self.long_ma) & (self.rsi < self.rsi_oversold_threshold)
+        exits = crossover_array(self.long_ma, self.short_ma)
+        return entries, exits
+
 def run_advanced_validation():
     """
     골든크로스와 RSI를 결합한 하이브리드 전략을 검증합니다.
@@ -11,6 +11,7 @@ class GoldenCross(Strategy):
     # 전략에 사용할 변수 정의
     short_ma_period = 15
     long_ma_period = 80
+    order_size = 0.95  # 매수 시 사용할 자산 비율
 
     def init(self):
         # 전략에 사용할 지표들을 미리 계산
@@ -21,12 +22,21 @@ class GoldenCross(Strategy):
     def next(self):
         # 골든크로스 발생 및 현재 포지션이 없을 경우, 자산의 95%를 매수
         if crossover(self.short_ma, self.long_ma) and not self.position:
-            self.buy(size=0.95)
+            self.buy(size=self.order_size)
 
         # 데드크로스 발생 및 현재 포지션이 있을 경우, 전량 매도
         elif crossover(self.long_ma, self.short_ma) and self.position:
             self.position.close()
 
+    def signals(self):
+        # next()와 같은 규칙을 배열로 표현 (tr_machine.vectorized 빠른 스크리닝용)
+        # tr_machine.vectorized에서만 호출되므로 스크립트 단독 실행에는 tr_machine이 필요 없음
+        from tr_machine.vectorized import crossover as crossover_array
+
+        entries = crossover_array(self.short_ma, self.long_ma)
+        exits = crossover_array(self.long_ma, self.short_ma)
+        return entries, exits
+
 def run_validation():
     """
     backtesting.py 라이브러리를 사용하여 골든크로스 전략을 교차 검증합니다.
@@ -3,65 +3,144 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
-def run_backtest(ticker="KRW-BTC", interval="day", short_window=20, long_window=60, initial_capital=1000000, fee_rate=0.0005):
+from tr_machine.checkpoint import load_checkpoint, save_checkpoint
+from tr_machine.indicators import sma
+from tr_machine.ohlcv import bar_arrays, find_bar, slice_bars
+
+def _init_state(bars, long_window, initial_capital):
+    """장기 MA가 처음 계산되는 캔들 다음부터 모의 투자를 시작하는 초기 상태"""
+    return {
+        'cash': initial_capital,
+        'holding': 0.0,
+        'position': None,     # 직전 캔들의 골든크로스 여부 (1/0)
+        'peak': None,         # 자산 최고점 (MDD 계산용)
+        'mdd': 0.0,
+        'first_close': None,  # Buy and Hold 기준 가격
+        'buffer': bars['close'][1:long_window],  # MA 계산용 직전 종가
+        'first_time': bars['time'][0],  # 데이터 시작 시각 (시작점이 바뀌면 이어서 계산하지 않음)
+        'last_time': bars['time'][long_window - 1],
+    }
+
+def _extend(state, new_bars, short_window, long_window, fee_rate):
+    """
+    state에 새 캔들을 이어서 모의 투자를 진행하고 캔들별 총 자산과 보유 여부를 반환합니다.
+    이동평균은 직전 종가 버퍼와 새 종가만으로 계산하므로 전체를 다시 계산한 결과와 같습니다.
+    """
+    new_close = new_bars['close']
+    closes = np.concatenate([state['buffer'], new_close])
+    short_ma = sma(closes, short_window)[len(state['buffer']):]
+    long_ma = sma(closes, long_window)[len(state['buffer']):]
+
+    totals = np.empty(len(new_close))
+    positions = np.empty(len(new_close), dtype=np.int8)
+    for i, close in enumerate(new_close):
+        position = 1 if short_ma[i] > long_ma[i] else 0
+        if state['position'] is not None:
+            signal = position - state['position']
+            if signal == 1: # 매수
+                state['holding'] = (state['cash'] / close) * (1 - fee_rate)
+                state['cash'] = 0
+            elif signal == -1: # 매도
+                state['cash'] = (state['holding'] * close) * (1 - fee_rate)
+                state['holding'] = 0
+        state['position'] = position
+
+        total = state['cash'] + state['holding'] * close
+        if state['first_close'] is None:
+            state['first_close'] = close
+        state['peak'] = total if state['peak'] is None else max(state['peak'], total)
+        state['mdd'] = min(state['mdd'], (total - state['peak']) / state['peak'])
+        totals[i] = total
+        positions[i] = 1 if state['holding'] else 0
+
+    if len(new_close):
+        state['buffer'] = closes[len(closes) - (long_window - 1):]
+        state['last_time'] = new_bars['time'][-1]
+    return totals, positions
+
+def _resume(checkpoint, bars):
+    """
+    체크포인트 이후 새 캔들이 시작하는 위치를 반환합니다.
+    데이터의 첫 캔들이 체크포인트와 다르거나(예: API의 최근 N개 구간이 밀린 경우),
+    체크포인트의 마지막 캔들이 데이터에 없거나 종가가 다르면 None을 반환합니다.
+    """
+    state = checkpoint['state']
+    if state.get('first_time') != bars['time'][0]:
+        return None
+    i = find_bar(bars['time'], state['last_time'])
+    if i is None or bars['close'][i] != state['buffer'][-1]:
+        return None
+    return i + 1
+
+def run_backtest(ticker="KRW-BTC", interval="day", short_window=20, long_window=60, initial_capital=1000000, fee_rate=0.0005, data=None, checkpoint=None):
     """
     골든크로스/데드크로스 전략 백테스팅을 실행하고 결과를 시각화합니다.
+    data에 DataFrame 또는 tr_machine.ohlcv.OHLCV를 넘기면 API 대신 해당 데이터를 사용합니다.
+    OHLCV는 DataFrame으로 바꾸지 않고 가격 배열을 그대로 사용합니다.
+    checkpoint에 파일 경로를 넘기면 저장된 상태에서 이어서 새 캔들만 계산합니다.
+    마지막 캔들은 아직 진행 중일 수 있으므로 체크포인트에는 그 직전까지만 저장합니다.
     """
     print(f"🚀 '{ticker}' 종목 골든크로스 전략 백테스팅 시작...")
     print(f"단기 MA: {short_window}일, 장기 MA: {long_window}일, 초기자본: {initial_capital:,.0f}원")
 
     # 1. 데이터 준비 (최근 1년치)
-    df = pyupbit.get_ohlcv(ticker, interval=interval, count=365 + long_window)
-    if df is None:
+    if data is None:
+        data = pyupbit.get_ohlcv(ticker, interval=interval, count=365 + long_window)
+    if data is None:
         print("❌ 데이터 로드 실패")
         return None
+    bars = bar_arrays(data, columns=('close',))
+
+    # 2. 체크포인트 확인
+    params = {'ticker': ticker, 'interval': interval, 'short_window': short_window,
+              'long_window': long_window, 'initial_capital': initial_capital, 'fee_rate': fee_rate}
+    saved = load_checkpoint(checkpoint, 'gc', params) if checkpoint else None
+    start = _resume(saved, bars) if saved else None
+    if start is not None:
+        state, curve = saved['state'], saved['curve']
+        print(f"♻️  체크포인트에서 이어서 계산합니다. (새 캔들 {len(bars['time']) - start}개)")
+    else:
+        state = _init_state(bars, long_window, initial_capital)
+        curve = {'time': bars['time'][:0], 'total': np.empty(0), 'position': np.empty(0, dtype=np.int8),
+                 'close': np.empty(0)}
+        start = long_window
+
+    # 3. 모의 투자 실행 (마지막 캔들 직전까지 계산 후 체크포인트 저장)
+    new_bars = slice_bars(bars, start)
+    committed, last = slice_bars(new_bars, None, -1), slice_bars(new_bars, -1)
+    totals, positions = _extend(state, committed, short_window, long_window, fee_rate)
+    curve = {
+        'time': np.concatenate([np.asarray(curve['time'], dtype='datetime64[ns]'), committed['time']]),
+        'total': np.concatenate([curve['total'], totals]),
+        'position': np.concatenate([curve['position'], positions]),
+        'close': np.concatenate([curve['close'], committed['close']]),
+    }
+    if checkpoint:
+        save_checkpoint(checkpoint, 'gc', params, state, curve)
+
+    last_totals, last_positions = _extend(state, last, short_window, long_window, fee_rate)
+    times = pd.DatetimeIndex(np.concatenate([curve['time'], last['time']]))
+    totals = np.concatenate([curve['total'], last_totals])
+    positions = np.concatenate([curve['position'], last_positions])
+    closes = np.concatenate([curve['close'], last['close']])
 
-    # 2. 전략 구현
-    df['short_ma'] = df['close'].rolling(window=short_window).mean()
-    df['long_ma'] = df['close'].rolling(window=long_window).mean()
-    df = df.iloc[long_window:].copy()
-    df['position'] = np.where(df['short_ma'] > df['long_ma'], 1, 0)
-    df['signal'] = df['position'].diff()
-
-    # 3. 모의 투자 실행
-    df['cash'] = 0.0
-    df['holding'] = 0.0
-    df.loc[df.index[0], 'cash'] = initial_capital
-
-    for i in range(1, len(df)):
-        prev_row = df.iloc[i-1]
-        current_row = df.iloc[i]
-        df.loc[df.index[i], 'cash'] = prev_row['cash']
-        df.loc[df.index[i], 'holding'] = prev_row['holding']
-
-        if df.loc[df.index[i], 'signal'] == 1: # 매수
-            buy_amount = prev_row['cash']
-            df.loc[df.index[i], 'holding'] = (buy_amount / current_row['close']) * (1 - fee_rate)
-            df.loc[df.index[i], 'cash'] = 0
-        elif df.loc[df.index[i], 'signal'] == -1: # 매도
-            sell_amount = prev_row['holding'] * current_row['close']
-            df.loc[df.index[i], 'cash'] = sell_amount * (1 - fee_rate)
-            df.loc[df.index[i], 'holding'] = 0
-
-    df['total'] = df['cash'] + df['holding'] * df['close']
-    
     # 4. 성과 분석
-    final_total = df['total'].iloc[-1]
+    final_total = totals[-1]
     total_return = (final_total / initial_capital) - 1
-    df['peak'] = df['total'].cummax()
-    df['drawdown'] = (df['total'] - df['peak']) / df['peak']
-    mdd = df['drawdown'].min()
+    mdd = state['mdd']
 
     # Buy and Hold 전략 성과
-    buy_and_hold_return = (df['close'].iloc[-1] / df['close'].iloc[0]) - 1
+    buy_and_hold_return = (closes[-1] / state['first_close']) - 1
 
     results = {
         "final_capital": final_total,
         "total_return_pct": total_return * 100,
         "buy_and_hold_pct": buy_and_hold_return * 100,
         "mdd_pct": mdd * 100,
+        "equity": pd.Series(totals, index=times),
+        "position": pd.Series(positions, index=times),
     }
-    
+
     print("\n✅ 백테스팅 완료!")
     print("---------------------------------")
     print(f"최종 자산: {results['final_capital']:,.0f}원")
@@ -69,11 +148,11 @@ def run_backtest(ticker="KRW-BTC", interval="day", short_window=20, long_window=
     print(f"단순 보유 수익률: {results['buy_and_hold_pct']:.2f}%")
     print(f"최대 낙폭 (MDD): {results['mdd_pct']:.2f}%")
     print("---------------------------------")
-    
+
     # 5. 시각화
     plt.figure(figsize=(14, 7))
-    plt.plot(df.index, df['total'] / initial_capital, label="Golden Cross Strategy")
-    plt.plot(df.index, df['close'] / df['close'].iloc[0], label="Buy and Hold")
+    plt.plot(times, totals / initial_capital, label="Golden Cross Strategy")
+    plt.plot(times, closes / closes[0], label="Buy and Hold")
     plt.title(f'Strategy Performance ({ticker}) - {short_window}d/{long_window}d MA')
     plt.xlabel('Date')
     plt.ylabel('Normalized Return')
@@ -81,9 +160,9 @@ def run_backtest(ticker="KRW-BTC", interval="day", short_window=20, long_window=
     plt.grid()
     plt.savefig('backtest_result.png')
     print("📈 백테스팅 결과가 'backtest_result.png' 파일로 저장되었습니다.")
-    
+
     return results
 
 if __name__ == '__main__':
     # 최적화된 파라미터(15, 80)로 백테스팅 실행
-    run_backtest(ticker="KRW-BTC", short_window=15, long_window=80)
\ No newline at end of file
+    run_backtest(ticker="KRW-BTC", short_window=15, long_window=80)
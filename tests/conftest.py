@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _ohlcv(times, close, rng):
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.round(np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, len(close))), -3),
+        'low': np.round(np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, len(close))), -3),
+        'close': close,
+        'volume': rng.uniform(1, 10, len(close)),
+    }, index=times)
+
+
+@pytest.fixture
+def market():
+    """추세가 바뀌며 골든/데드크로스가 여러 번 생기는 일봉과 4시간봉 (가격은 1,000원 단위)"""
+    rng = np.random.default_rng(7)
+    n_days = 160
+    drift = np.repeat(rng.choice([-0.004, 0.004], size=n_days // 20 + 1), 20 * 6)[:n_days * 6]
+    close_4h = np.round(50_000_000 * np.exp(np.cumsum(drift + rng.normal(0, 0.01, n_days * 6))), -3)
+    times_4h = pd.date_range('2024-01-01 09:00', periods=n_days * 6, freq='4h')
+    df_4h = _ohlcv(times_4h, close_4h, rng)
+    df_daily = _ohlcv(pd.date_range('2024-01-01 09:00', periods=n_days, freq='D'),
+                      close_4h[5::6], rng)
+    return df_daily, df_4h
@@ -0,0 +1,79 @@
+"""체크포인트에서 이어서 계산한 결과가 전체를 다시 계산한 결과와 같은지 확인합니다."""
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyupbit')
+
+from tr_machine.cli import load_script
+
+
+@pytest.fixture(autouse=True)
+def _run_in_tmp(tmp_path, monkeypatch):
+    # 백테스터가 그래프를 현재 폴더에 저장하므로 임시 폴더에서 실행
+    monkeypatch.chdir(tmp_path)
+    yield
+    plt.close('all')
+
+
+def _assert_same(resumed, full):
+    assert resumed['final_capital'] == full['final_capital']
+    assert resumed['mdd_pct'] == full['mdd_pct']
+    pd.testing.assert_series_equal(resumed['equity'], full['equity'])
+    pd.testing.assert_series_equal(resumed['position'], full['position'])
+
+
+@pytest.mark.parametrize('first_days', [40, 100])
+def test_hybrid_checkpoint_chain_matches_full_run(market, tmp_path, first_days):
+    # first_days=40: 장기 MA(80일)보다 짧은 기간에서 시작해 버퍼가 채워지는 중에 체크포인트 저장
+    hybrid = load_script('hybrid_backtest')
+    df_daily, df_4h = market
+    checkpoint = tmp_path / 'hybrid.pkl'
+
+    for days in range(first_days, len(df_daily) + 1, 10):
+        data_daily, data_4h = df_daily.iloc[:days], df_4h.iloc[:days * 6]
+        resumed = hybrid.run_hybrid_backtest(initial_capital=1_000_000.0, data_daily=data_daily,
+                                             data_4h=data_4h, checkpoint=checkpoint)
+        full = hybrid.run_hybrid_backtest(initial_capital=1_000_000.0, data_daily=data_daily,
+                                          data_4h=data_4h)
+        _assert_same(resumed, full)
+        plt.close('all')
+
+
+@pytest.mark.parametrize('first_bars', [81, 120])
+def test_gc_checkpoint_chain_matches_full_run(market, tmp_path, first_bars):
+    local_backtest = load_script('local_backtest')
+    df_daily, _ = market
+    checkpoint = tmp_path / 'gc.pkl'
+
+    for bars in range(first_bars, len(df_daily) + 1, 10):
+        data = df_daily.iloc[:bars]
+        resumed = local_backtest.run_backtest(short_window=15, long_window=80, data=data,
+                                              checkpoint=checkpoint)
+        full = local_backtest.run_backtest(short_window=15, long_window=80, data=data)
+        _assert_same(resumed, full)
+        plt.close('all')
+
+
+def test_shifted_window_falls_back_to_full_run(market, tmp_path):
+    # API의 최근 N개 구간처럼 시작점이 밀린 데이터는 체크포인트를 쓰지 않고 처음부터 계산
+    local_backtest = load_script('local_backtest')
+    hybrid = load_script('hybrid_backtest')
+    df_daily, df_4h = market
+
+    local_backtest.run_backtest(short_window=15, long_window=80, data=df_daily.iloc[:120],
+                                checkpoint=tmp_path / 'gc.pkl')
+    shifted = df_daily.iloc[5:125]
+    _assert_same(local_backtest.run_backtest(short_window=15, long_window=80, data=shifted,
+                                             checkpoint=tmp_path / 'gc.pkl'),
+                 local_backtest.run_backtest(short_window=15, long_window=80, data=shifted))
+
+    hybrid.run_hybrid_backtest(initial_capital=1_000_000.0, data_daily=df_daily.iloc[:120],
+                               data_4h=df_4h.iloc[:120 * 6], checkpoint=tmp_path / 'hybrid.pkl')
+    shifted_daily, shifted_4h = df_daily.iloc[5:125], df_4h.iloc[5 * 6:125 * 6]
+    _assert_same(hybrid.run_hybrid_backtest(initial_capital=1_000_000.0, data_daily=shifted_daily,
+                                            data_4h=shifted_4h, checkpoint=tmp_path / 'hybrid.pkl'),
+                 hybrid.run_hybrid_backtest(initial_capital=1_000_000.0, data_daily=shifted_daily,
+                                            data_4h=shifted_4h))
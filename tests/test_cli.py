@@ -0,0 +1,27 @@
+"""통합 CLI 동작 확인"""
+import pytest
+
+pyupbit = pytest.importorskip('pyupbit')
+
+from tr_machine.cli import main
+
+
+@pytest.mark.parametrize('strategy', ['gc', 'hybrid'])
+def test_local_backtest_without_data_fails_instead_of_calling_api(monkeypatch, strategy):
+    def get_ohlcv(*args, **kwargs):
+        raise AssertionError("--local 에서 API를 호출하면 안 됩니다.")
+
+    monkeypatch.setattr(pyupbit, 'get_ohlcv', get_ohlcv)
+    with pytest.raises(SystemExit) as excinfo:
+        main(['backtest', '--local', '--strategy', strategy, '--ticker', 'KRW-NOT-SYNCED'])
+    assert 'sync-data' in str(excinfo.value.code)
+
+
+def test_checkpoint_requires_local(monkeypatch):
+    def get_ohlcv(*args, **kwargs):
+        raise AssertionError("--checkpoint 오류 전에 API를 호출하면 안 됩니다.")
+
+    monkeypatch.setattr(pyupbit, 'get_ohlcv', get_ohlcv)
+    with pytest.raises(SystemExit) as excinfo:
+        main(['backtest', '--checkpoint', 'gc_daily'])
+    assert '--local' in str(excinfo.value.code)
@@ -0,0 +1,41 @@
+"""하이브리드 백테스터의 평가 자산 곡선 확인"""
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+pytest.importorskip('pyupbit')
+
+from tr_machine.cli import load_script
+from tr_machine.montecarlo import returns_from_equity, trade_returns
+
+
+@pytest.fixture
+def results(market, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df_daily, df_4h = market
+    results = load_script('hybrid_backtest').run_hybrid_backtest(
+        initial_capital=1_000_000.0, data_daily=df_daily, data_4h=df_4h)
+    plt.close('all')
+    return results
+
+
+def test_equity_is_marked_to_market_while_holding(results):
+    equity = results['equity'].to_numpy()
+    holding = results['position'].to_numpy() == 1
+    assert holding.any()
+
+    # 보유 중인 캔들끼리는 자산이 종가에 따라 움직이고, 보유 중 손실도 캔들 수익률에 나타남
+    returns = returns_from_equity(equity)
+    assert (returns[holding[1:] & holding[:-1]] != 0).any()
+    assert returns.min() < 0
+    # 미보유 구간은 실현 자본 그대로
+    flat = ~holding
+    assert (np.diff(equity)[flat[1:] & flat[:-1]] == 0).all()
+    assert equity[-1] == results['final_capital']
+
+
+def test_trade_returns_compound_to_final_capital(results):
+    returns = trade_returns(results['equity'].to_numpy(), results['position'].to_numpy())
+    np.testing.assert_allclose(np.prod(1 + returns) * 1_000_000.0, results['final_capital'])
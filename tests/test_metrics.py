@@ -0,0 +1,117 @@
+"""tr_machine.metrics 의 벡터 연산 결과가 실행별 단순 반복 계산과 같은지 확인"""
+import math
+
+import numpy as np
+import pytest
+
+from tr_machine.metrics import METRIC_NAMES, compute_metrics
+
+
+def _reference(equity, position, periods_per_year):
+    """실행 1개의 지표를 캔들 단위 반복문으로 계산"""
+    n = len(equity)
+    years = (n - 1) / periods_per_year
+    cagr = (equity[-1] / equity[0]) ** (1 / years) - 1
+
+    peak, mdd = equity[0], 0.0
+    for value in equity:
+        peak = max(peak, value)
+        mdd = min(mdd, (value - peak) / peak)
+
+    returns = [equity[i] / equity[i - 1] - 1 for i in range(1, n)]
+    mean = sum(returns) / len(returns)
+    std = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+    downside = math.sqrt(sum(min(r, 0) ** 2 for r in returns) / len(returns))
+
+    n_trades = wins = held = 0
+    entry_equity = None
+    for i in range(n):
+        holding = position[i] != 0
+        was_holding = i > 0 and position[i - 1] != 0
+        if holding and not was_holding:
+            n_trades += 1
+            entry_equity = equity[i - 1] if i > 0 else equity[0]
+        if was_holding and not holding:
+            wins += equity[i] > entry_equity
+        held += holding
+    if position[-1] != 0:  # 마지막까지 보유 중인 거래는 마지막 캔들 기준으로 평가
+        wins += equity[-1] > entry_equity
+
+    return {
+        'total_return': equity[-1] / equity[0] - 1,
+        'cagr': cagr,
+        'mdd': mdd,
+        'sharpe': mean / std * math.sqrt(periods_per_year),
+        'sortino': mean / downside * math.sqrt(periods_per_year) if downside else math.nan,
+        'calmar': cagr / -mdd if mdd else math.nan,
+        'exposure': held / n,
+        'n_trades': n_trades,
+        'win_rate': wins / n_trades if n_trades else math.nan,
+        'avg_trade_bars': held / n_trades if n_trades else math.nan,
+    }
+
+
+@pytest.fixture
+def runs():
+    """보유/미보유가 번갈아 나오는 자산 곡선 40개 x 300캔들"""
+    rng = np.random.default_rng(3)
+    n_runs, n_bars = 40, 300
+    position = (rng.random((n_runs, n_bars)) < 0.1).cumsum(axis=1) % 2
+    returns = np.where(position != 0, rng.normal(0.001, 0.02, (n_runs, n_bars)), 0.0)
+    equity = 1_000_000 * np.cumprod(1 + returns, axis=1)
+
+    position[0] = 0                  # 거래 없음
+    position[1, :] = 1               # 첫 캔들부터 끝까지 보유
+    position[2, -20:] = 1            # 마지막 거래가 청산되지 않음
+    position[3, -10:] = [1] * 9 + [0]  # 마지막 캔들에 청산
+    equity[4] = np.linspace(1_000_000, 1_200_000, n_bars)  # 낙폭과 손실 캔들이 없음
+    return equity, position
+
+
+def test_matches_per_run_loop(runs):
+    equity, position = runs
+    results = compute_metrics(equity, position, periods_per_year=365)
+
+    for i in range(len(equity)):
+        expected = _reference(equity[i], position[i], 365)
+        for name in METRIC_NAMES:
+            np.testing.assert_allclose(results[name][i], expected[name], rtol=1e-10,
+                                       err_msg=f"실행 {i}의 {name}")
+
+
+def test_open_and_missing_trades(runs):
+    equity, position = runs
+    results = compute_metrics(equity, position)
+
+    assert results['n_trades'][0] == 0
+    assert np.isnan(results['win_rate'][0]) and np.isnan(results['avg_trade_bars'][0])
+    assert results['n_trades'][1] == 1 and results['exposure'][1] == 1
+    assert results['avg_trade_bars'][1] == equity.shape[1]
+    # 보유 중인 마지막 거래도 거래 수와 보유 기간에 포함
+    assert position[2, -1] == 1
+    assert results['avg_trade_bars'][2] == position[2].sum() / results['n_trades'][2]
+    assert np.isnan(results['calmar'][4]) and np.isnan(results['sortino'][4])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64])
+def test_chunk_size_gives_same_result(runs, chunk_size):
+    equity, position = runs
+    full = compute_metrics(equity, position)
+    chunked = compute_metrics(equity, position, chunk_size=chunk_size)
+    for name in METRIC_NAMES:
+        np.testing.assert_array_equal(chunked[name], full[name])
+
+
+def test_without_positions():
+    equity = np.array([100.0, 110.0, 99.0, 120.0])
+    results = compute_metrics(equity)
+
+    assert results['mdd'][0] == pytest.approx(-0.1)
+    assert results['total_return'][0] == pytest.approx(0.2)
+    for name in ('exposure', 'n_trades', 'win_rate', 'avg_trade_bars'):
+        assert np.isnan(results[name][0])
+
+
+def test_position_shape_must_match():
+    with pytest.raises(ValueError):
+        compute_metrics(np.ones((2, 5)), np.ones((2, 4)))
@@ -0,0 +1,78 @@
+"""tr_machine.montecarlo 경로 시뮬레이션이 경로 전체를 만드는 단순 계산과 같은지 확인"""
+import numpy as np
+import pytest
+
+from tr_machine.montecarlo import _resample_indices, simulate_paths
+
+
+def _reference_indices(rng, n, n_steps, n_paths, block_size):
+    """블록 시작점을 같은 순서로 뽑고 블록 안의 인덱스를 반복문으로 이어 붙임 (끝에서 처음으로 이어짐)"""
+    if block_size <= 1:
+        return rng.integers(0, n, size=(n_steps, n_paths), dtype=np.int32)
+    n_blocks = -(-n_steps // block_size)
+    starts = rng.integers(0, n, size=(n_blocks, n_paths), dtype=np.int32)
+    idx = np.empty((n_blocks * block_size, n_paths), dtype=np.int64)
+    for b in range(n_blocks):
+        for k in range(block_size):
+            for p in range(n_paths):
+                idx[b * block_size + k, p] = (starts[b, p] + k) % n
+    return idx[:n_steps]
+
+
+def _reference_paths(returns, n_paths, n_steps, block_size, ruin_level, chunk_size, seed):
+    """구간별로 인덱스를 뽑아 경로 전체의 자산 곡선을 만든 뒤 cumprod/cummax로 계산"""
+    rng = np.random.default_rng(seed)
+    chunk_size = -(-chunk_size // block_size) * block_size
+    idx = np.concatenate([
+        _reference_indices(rng, len(returns), min(chunk_size, n_steps - start), n_paths, block_size)
+        for start in range(0, n_steps, chunk_size)
+    ])
+    equity = np.cumprod(1 + returns[idx], axis=0)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=0), 1)
+    return {
+        'final_return': equity[-1] - 1,
+        'mdd': np.minimum((equity / peak - 1).min(axis=0), 0),
+        'ruined': np.minimum(equity.min(axis=0), 1) <= ruin_level,
+    }
+
+
+@pytest.fixture
+def returns():
+    return np.random.default_rng(11).normal(0.002, 0.08, 17)
+
+
+@pytest.mark.parametrize('block_size, chunk_size, n_steps', [
+    (1, 1000, 40),   # 일반 부트스트랩, 구간 1개
+    (1, 7, 40),      # 구간 길이 < 경로 길이
+    (3, 4, 40),      # 구간 길이가 블록 길이의 배수(6)로 올림, 마지막 블록은 잘림
+    (5, 10, 23),
+    (6, 12, 60),     # 경로 길이 > 수익률 개수: 블록이 끝에서 처음으로 이어짐
+])
+def test_matches_full_path_reference(returns, block_size, chunk_size, n_steps):
+    result = simulate_paths(returns, n_paths=300, n_steps=n_steps, block_size=block_size,
+                            ruin_level=0.8, chunk_size=chunk_size, seed=5)
+    expected = _reference_paths(returns, 300, n_steps, block_size, 0.8, chunk_size, seed=5)
+
+    np.testing.assert_allclose(result['final_return'], expected['final_return'], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(result['mdd'], expected['mdd'], rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(result['ruined'], expected['ruined'])
+    assert result['ruin_probability'] == expected['ruined'].mean()
+    assert 0 < result['ruin_probability'] < 1  # 파산/생존 경로가 모두 있어야 비교가 의미 있음
+
+
+def test_blocks_are_consecutive_and_wrap_around():
+    n, block_size = 7, 4
+    idx = _resample_indices(np.random.default_rng(0), n, 22, 50, block_size)
+    assert idx.shape == (22, 50)
+    assert idx.min() >= 0 and idx.max() < n
+
+    for b in range(0, 22, block_size):
+        block = idx[b:b + block_size]
+        np.testing.assert_array_equal(block, (block[0] + np.arange(len(block))[:, None]) % n)
+    # 시작점이 끝 근처인 블록은 처음 인덱스로 이어짐
+    assert (np.diff(idx[:block_size], axis=0) < 0).any()
+
+
+def test_empty_returns_raise():
+    with pytest.raises(ValueError):
+        simulate_paths(np.empty(0))
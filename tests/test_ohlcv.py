@@ -0,0 +1,88 @@
+"""OHLCV 컨테이너와 자체 백테스터의 OHLCV 입력 확인"""
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from tr_machine.ohlcv import OHLCV
+
+
+def test_round_trip_keeps_prices_and_times(market):
+    df_daily, _ = market
+    data = OHLCV.from_dataframe(df_daily)
+    restored = data.to_dataframe()
+
+    for column in ('open', 'high', 'low', 'close'):
+        np.testing.assert_array_equal(restored[column].to_numpy(), df_daily[column].to_numpy())
+    assert restored.index.equals(df_daily.index)
+    assert data.nbytes < df_daily.memory_usage(index=True).sum()
+
+
+def test_save_and_load(market, tmp_path):
+    df_daily, _ = market
+    data = OHLCV.from_dataframe(df_daily)
+    data.save(tmp_path / 'day.npz')
+    loaded = OHLCV.load(tmp_path / 'day.npz')
+
+    np.testing.assert_array_equal(loaded.close, data.close)
+    np.testing.assert_array_equal(loaded.timestamps, data.timestamps)
+    assert loaded.index_name is None
+    pd.testing.assert_frame_equal(loaded.to_dataframe(), data.to_dataframe())
+
+
+def test_save_and_load_keeps_index_name(market, tmp_path):
+    df_daily, _ = market
+    df_daily = df_daily.rename_axis('candle_date_time_kst')
+    OHLCV.from_dataframe(df_daily).save(tmp_path / 'day.npz')
+    restored = OHLCV.load(tmp_path / 'day.npz').to_dataframe()
+
+    assert restored.index.name == 'candle_date_time_kst'
+    pd.testing.assert_frame_equal(restored, OHLCV.from_dataframe(df_daily).to_dataframe())
+
+
+def test_load_ohlcv_compact(market, tmp_path):
+    pytest.importorskip('pyupbit')
+    from tr_machine.data import compact_path, load_ohlcv_compact
+
+    df_daily, _ = market
+    assert load_ohlcv_compact('KRW-BTC', 'day', tmp_path) is None
+
+    df_daily.rename_axis('datetime').to_csv(tmp_path / 'KRW-BTC_day.csv')
+    data = load_ohlcv_compact('KRW-BTC', 'day', tmp_path)
+    assert isinstance(data, OHLCV)
+    assert compact_path('KRW-BTC', 'day', tmp_path).exists()
+    np.testing.assert_array_equal(data.close, df_daily['close'].to_numpy())
+    # 두 번째부터는 .npz를 바로 읽음 (인덱스 이름도 CSV에서 읽은 것과 같아야 함)
+    cached = load_ohlcv_compact('KRW-BTC', 'day', tmp_path)
+    np.testing.assert_array_equal(cached.close, data.close)
+    assert cached.index_name == 'datetime'
+    pd.testing.assert_frame_equal(cached.to_dataframe(), data.to_dataframe())
+
+
+def test_engines_use_ohlcv_without_dataframe(market, tmp_path, monkeypatch):
+    pytest.importorskip('pyupbit')
+    from tr_machine.cli import load_script
+
+    monkeypatch.chdir(tmp_path)
+    df_daily, df_4h = market
+    expected_gc = load_script('local_backtest').run_backtest(short_window=15, long_window=80, data=df_daily)
+    expected_hybrid = load_script('hybrid_backtest').run_hybrid_backtest(
+        initial_capital=1_000_000.0, data_daily=df_daily, data_4h=df_4h)
+
+    def to_dataframe(self):
+        raise AssertionError("자체 백테스터는 OHLCV를 DataFrame으로 복원하지 않아야 합니다.")
+
+    monkeypatch.setattr(OHLCV, 'to_dataframe', to_dataframe)
+    gc = load_script('local_backtest').run_backtest(
+        short_window=15, long_window=80, data=OHLCV.from_dataframe(df_daily))
+    hybrid = load_script('hybrid_backtest').run_hybrid_backtest(
+        initial_capital=1_000_000.0, data_daily=OHLCV.from_dataframe(df_daily),
+        data_4h=OHLCV.from_dataframe(df_4h))
+    plt.close('all')
+
+    pd.testing.assert_series_equal(gc['equity'], expected_gc['equity'])
+    pd.testing.assert_series_equal(hybrid['equity'], expected_hybrid['equity'])
+    assert gc['final_capital'] == expected_gc['final_capital']
+    assert hybrid['final_capital'] == expected_hybrid['final_capital']
@@ -0,0 +1,103 @@
+"""배열 엔진(tr_machine.vectorized)이 backtesting.py Backtest와 같은 결과를 내는지 확인"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyupbit')
+backtesting = pytest.importorskip('backtesting')
+
+from tr_machine import vectorized
+from tr_machine.cli import load_script
+
+
+
+@pytest.fixture
+def df():
+    """변동성이 커서 골든/데드크로스와 RSI 과매도가 자주 생기는 500일 일봉 (backtesting.py 형식)"""
+    rng = np.random.default_rng(0)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.03, 500)))
+    open_ = close * np.exp(rng.normal(0, 0.01, 500))
+    return pd.DataFrame({
+        'Open': open_, 'High': np.maximum(open_, close) * 1.01, 'Low': np.minimum(open_, close) * 0.99,
+        'Close': close, 'Volume': rng.uniform(1, 10, 500),
+    }, index=pd.date_range('2023-01-01', periods=500, freq='D'))
+
+
+def _backtest(strategy, df, params):
+    bt = backtesting.Backtest(df, strategy, cash=100_000_000, commission=.0005)
+    return bt.run(**params)
+
+
+def test_screen_matches_backtest(df):
+    strategy = load_script('advanced_validator').GcRsiStrategy
+    candidates = load_script('strategy_optimizer').param_candidates()[::15]
+    results = vectorized.screen(strategy, df, candidates)
+
+    assert results['n_closed_trades'].sum() > 0
+    for i, params in enumerate(candidates):
+        stats = _backtest(strategy, df, params)
+        assert results['final_equity'][i] == stats['Equity Final [$]']
+        assert results['n_closed_trades'][i] == stats['# Trades']
+    stats = _backtest(strategy, df, candidates[0])
+    assert (results['equity'][0] == stats['_equity_curve']['Equity'].to_numpy()).all()
+
+
+def test_golden_cross_matches_backtest(df):
+    strategy = load_script('bt_validator').GoldenCross
+    params = [{'short_ma_period': s, 'long_ma_period': l} for s in (5, 10, 20) for l in (30, 60)]
+    results = vectorized.screen(strategy, df, params)
+    assert results['n_closed_trades'].min() > 0
+    assert vectorized.verify_with_backtest(strategy, df, params, results=results, rtol=0)
+
+
+def test_open_trade_counts_as_entry_not_closed_trade(df):
+    strategy = load_script('bt_validator').GoldenCross
+    params = [{'short_ma_period': 5, 'long_ma_period': 30}]
+    held = np.flatnonzero(vectorized.screen(strategy, df, params)['position'][0])
+    # 보유 중인 캔들에서 데이터를 잘라 마지막 거래가 청산되지 않은 상태를 만듦
+    results = vectorized.screen(strategy, df.iloc[:held[-1] - 5], params)
+
+    assert results['position'][0, -1] != 0
+    assert results['n_trades'][0] == results['n_closed_trades'][0] + 1
+    assert results['n_closed_trades'][0] == _backtest(strategy, df.iloc[:held[-1] - 5], params[0])['# Trades']
+    # 승률과 평균 보유 기간은 같은 진입 횟수로 나눔
+    assert results['avg_trade_bars'][0] == (results['position'][0] != 0).sum() / results['n_trades'][0]
+
+
+@pytest.mark.parametrize('order_size', [0.5, 3])
+def test_order_size_comes_from_strategy(df, order_size):
+    base = load_script('bt_validator').GoldenCross
+    strategy = type('GoldenCrossSized', (base,), {'order_size': order_size})
+    params = [{'short_ma_period': 5, 'long_ma_period': 30}, {'short_ma_period': 10, 'long_ma_period': 60}]
+
+    results = vectorized.screen(strategy, df, params)
+    default = vectorized.screen(base, df, params)
+    assert (results['final_equity'] != default['final_equity']).any()
+    assert vectorized.verify_with_backtest(strategy, df, params, results=results, rtol=0)
+
+
+def test_strategy_without_order_size_is_rejected(df):
+    base = load_script('bt_validator').GoldenCross
+
+    class NoSize(backtesting.Strategy):
+        init = base.init
+        signals = base.signals
+        short_ma_period = 15
+        long_ma_period = 80
+
+    with pytest.raises(TypeError, match='order_size'):
+        vectorized.screen(NoSize, df, [{}])
+
+
+def test_random_search_picks_best_sampled_candidate(df):
+    optimizer = load_script('strategy_optimizer')
+    candidates = optimizer.param_candidates()[::30]
+    results = vectorized.screen(optimizer.GcRsiStrategy, df, candidates)
+
+    best_params, best_stats, n_runs = optimizer.random_search(df, candidates, n_samples=len(candidates))
+    assert n_runs == len(candidates)
+    assert best_params == candidates[int(np.argmax(results['final_equity']))]
+    assert best_stats['Equity Final [$]'] == results['final_equity'].max()
+
+    _, _, n_runs = optimizer.random_search(df, candidates, n_samples=5)
+    assert n_runs == 5
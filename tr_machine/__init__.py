@@ -0,0 +1,5 @@
+"""
+tr_machine: 백테스터, 검증기, 최적화기, 분석기, 봇을 하나로 묶는 패키지.
+
+`python -m tr_machine <subcommand>` 형태로 실행합니다.
+"""
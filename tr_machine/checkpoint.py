@@ -0,0 +1,39 @@
+"""
+백테스트 체크포인트 저장/불러오기.
+
+자체 백테스터는 마지막으로 확정된 캔들까지의 상태(현금, 보유량, 진입가, 지표 계산용 버퍼,
+최고점/MDD)와 자산 곡선을 저장해 두고, 새 캔들이 생기면 그 이후 구간만 계산합니다.
+"""
+import pickle
+from pathlib import Path
+
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent / 'data' / 'checkpoints'
+
+
+def checkpoint_path(name, checkpoint_dir=CHECKPOINT_DIR):
+    """체크포인트 이름에 해당하는 파일 경로를 반환합니다."""
+    return Path(checkpoint_dir) / f"{name}.pkl"
+
+
+def load_checkpoint(path, engine, params):
+    """
+    체크포인트를 불러옵니다.
+    파일이 없거나 엔진/파라미터가 다르면 처음부터 다시 계산하도록 None을 반환합니다.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('engine') != engine or checkpoint.get('params') != params:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, engine, params, state, curve):
+    """엔진 상태와 자산 곡선을 저장합니다."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    checkpoint = {'engine': engine, 'params': params, 'state': state, 'curve': curve}
+    with open(path, 'wb') as f:
+        pickle.dump(checkpoint, f)
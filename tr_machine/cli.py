@@ -0,0 +1,301 @@
+"""
+모든 도구를 하나의 진입점에서 실행하는 CLI.
+
+pandas, numpy, matplotlib, pyupbit, backtesting 같은 무거운 의존성은
+이 모듈에서 import 하지 않습니다. 서브커맨드가 실제로 실행될 때에만
+해당 스크립트를 불러오므로 `--help` 는 즉시 응답합니다.
+
+    python -m tr_machine backtest --short 15 --long 80
+    python -m tr_machine --startup-time validate
+"""
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+_START = time.perf_counter()
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 서브커맨드가 불러오는 스크립트 (모듈 이름 -> 저장소 루트 기준 경로)
+SCRIPTS = {
+    'local_backtest': 'local_backtest.py',
+    'hybrid_backtest': '01_strategy_backtesters/00_custom_backtester/hybrid_backtest.py',
+    'volatility_breakout': '01_strategy_backtesters/00_custom_backtester/volatility_breakout.py',
+    'optimizer': '01_strategy_backtesters/00_custom_backtester/optimizer.py',
+    'bt_validator': '01_strategy_backtesters/bt_validator.py',
+    'advanced_validator': '01_strategy_backtesters/advanced_validator.py',
+    'strategy_optimizer': '01_strategy_backtesters/strategy_optimizer.py',
+    'my_bot': '02_live_bots/my_bot.py',
+    'tick_analyzer': '03_analysis_tools/tick_analyzer.py',
+    'tick_analyzer_pro': '03_analysis_tools/tick_analyzer_pro.py',
+}
+
+
+def load_script(name):
+    """
+    스크립트 파일을 모듈로 불러옵니다. 무거운 의존성은 이 시점에 처음 import 됩니다.
+    직접 실행할 때와 같도록 스크립트 폴더와 저장소 루트를 sys.path 에 추가합니다.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    path = ROOT / SCRIPTS[name]
+    for search_path in (str(ROOT), str(path.parent)):
+        if search_path not in sys.path:
+            sys.path.insert(0, search_path)
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+# -----------------------------------------------------------------------------
+# 서브커맨드별 필요한 스크립트와 실행 함수
+# -----------------------------------------------------------------------------
+BACKTEST_SCRIPTS = {'gc': 'local_backtest', 'hybrid': 'hybrid_backtest'}
+OPTIMIZE_SCRIPTS = {'ma': 'optimizer', 'vb': 'volatility_breakout', 'gc-rsi': 'strategy_optimizer'}
+VALIDATE_SCRIPTS = {'gc': 'bt_validator', 'gc-rsi': 'advanced_validator'}
+ANALYZE_SCRIPTS = {'basic': 'tick_analyzer', 'pro': 'tick_analyzer_pro'}
+
+
+def _backtest_modules(args):
+    return [BACKTEST_SCRIPTS[args.strategy]]
+
+
+def _load_local(ticker, interval):
+    """
+    --local 데이터를 OHLCV 컨테이너로 불러옵니다. 파일이 없으면 API로 대신 받지 않고 종료합니다.
+    (API 데이터가 섞이면 체크포인트 연속성이 깨질 수 있음)
+    """
+    from tr_machine.data import data_path, load_ohlcv_compact
+
+    data = load_ohlcv_compact(ticker, interval)
+    if data is None:
+        sys.exit(f"❌ 저장된 데이터가 없습니다: {data_path(ticker, interval)}\n"
+                 f"   먼저 'python -m tr_machine sync-data {ticker} --interval {interval}' 를 실행하세요.")
+    return data
+
+
+def cmd_backtest(args):
+    if args.checkpoint and not args.local:
+        # API는 최근 N개 캔들만 주므로 실행할 때마다 시작점이 밀려 이어서 계산한 결과가 달라짐
+        sys.exit("❌ --checkpoint는 --local과 함께 사용해야 합니다. (sync-data로 저장한 데이터 기준)")
+    module = load_script(BACKTEST_SCRIPTS[args.strategy])
+    checkpoint = None
+    if args.checkpoint:
+        from tr_machine.checkpoint import checkpoint_path
+        checkpoint = checkpoint_path(args.checkpoint)
+
+    if args.strategy == 'gc':
+        data = _load_local(args.ticker, args.interval) if args.local else None
+        return module.run_backtest(ticker=args.ticker, interval=args.interval,
+                            short_window=args.short, long_window=args.long,
+                            initial_capital=args.capital, fee_rate=args.fee,
+                            data=data, checkpoint=checkpoint)
+    else:
+        data_daily = data_4h = None
+        if args.local:
+            data_daily = _load_local(args.ticker, 'day')
+            data_4h = _load_local(args.ticker, 'minute240')
+        return module.run_hybrid_backtest(ticker=args.ticker, initial_capital=args.capital,
+                                   fee_rate=args.fee, data_daily=data_daily, data_4h=data_4h,
+                                   checkpoint=checkpoint)
+
+
+def _montecarlo_modules(args):
+    return _backtest_modules(args) + ['tr_machine.montecarlo']
+
+
+def cmd_montecarlo(args):
+    results = cmd_backtest(args)
+    if results is None:
+        return
+
+    from tr_machine import montecarlo
+    equity = results['equity'].to_numpy()
+    if args.by == 'trade':
+        returns = montecarlo.trade_returns(equity, results['position'].to_numpy())
+    else:
+        returns = montecarlo.returns_from_equity(equity)
+    if len(returns) == 0:
+        print("❌ 분석할 수익률이 없습니다. (거래 없음)")
+        return
+
+    started = time.perf_counter()
+    result = montecarlo.simulate_paths(returns, n_paths=args.paths, block_size=args.block,
+                                       ruin_level=args.ruin, seed=args.seed)
+    montecarlo.print_report(result, ruin_level=args.ruin)
+    print(f"⏱️  {args.paths:,}개 경로 x {len(returns):,}단계: {time.perf_counter() - started:.2f}초")
+
+
+def _optimize_modules(args):
+    names = [OPTIMIZE_SCRIPTS[args.target]]
+    if args.target == 'ma':
+        names.insert(0, 'local_backtest')
+    return names
+
+
+def cmd_optimize(args):
+    if args.target == 'ma':
+        load_script('local_backtest')
+        load_script('optimizer').optimize_strategy()
+    elif args.target == 'vb':
+        load_script('volatility_breakout').optimize_and_visualize()
+    else:
+        load_script('strategy_optimizer').run_optimizer(search=args.search, n_samples=args.samples,
+                                                       n_verify=args.verify)
+
+
+def _validate_modules(args):
+    return [VALIDATE_SCRIPTS[args.strategy]]
+
+
+def cmd_validate(args):
+    if args.strategy == 'gc':
+        load_script('bt_validator').run_validation()
+    else:
+        load_script('advanced_validator').run_advanced_validation()
+
+
+def _analyze_modules(args):
+    return [ANALYZE_SCRIPTS[args.mode]]
+
+
+def cmd_analyze(args):
+    if args.mode == 'basic':
+        load_script('tick_analyzer').run_tick_analyzer(ticker=args.ticker)
+        return
+
+    import asyncio
+    module = load_script('tick_analyzer_pro')
+    try:
+        asyncio.run(module.run_pro_analyzer(ticker=args.ticker))
+    except KeyboardInterrupt:
+        print("\n👋 분석기를 종료합니다.")
+
+
+def _bot_modules(args):
+    return ['my_bot']
+
+
+def cmd_bot(args):
+    load_script('my_bot').run_trading_bot()
+
+
+def _sync_data_modules(args):
+    return ['tr_machine.data']
+
+
+def cmd_sync_data(args):
+    from tr_machine import data
+
+    for ticker in args.tickers:
+        data.sync_ohlcv(ticker, interval=args.interval, count=args.count)
+
+
+def _import_for_timing(name):
+    if name in SCRIPTS:
+        load_script(name)
+    else:
+        importlib.import_module(name)
+
+
+def report_startup_time(args):
+    """서브커맨드 실행에 필요한 모듈만 불러오고 콜드 스타트 시간을 출력합니다."""
+    cli_ready = time.perf_counter() - _START
+    print(f"⏱️  '{args.command}' 콜드 스타트 측정")
+    print(f"CLI 준비: {cli_ready:.3f}초")
+
+    total = cli_ready
+    for name in args.modules(args):
+        started = time.perf_counter()
+        _import_for_timing(name)
+        elapsed = time.perf_counter() - started
+        total += elapsed
+        print(f"  - {name} 로드: {elapsed:.3f}초")
+    print(f"합계: {total:.3f}초")
+
+
+def _add_backtest_arguments(p):
+    p.add_argument('--strategy', choices=sorted(BACKTEST_SCRIPTS), default='gc')
+    p.add_argument('--ticker', default='KRW-BTC')
+    p.add_argument('--interval', default='day', help="골든크로스 전략의 캔들 단위")
+    p.add_argument('--short', type=int, default=15, help="단기 MA 기간")
+    p.add_argument('--long', type=int, default=80, help="장기 MA 기간")
+    p.add_argument('--capital', type=float, default=1000000)
+    p.add_argument('--fee', type=float, default=0.0005)
+    p.add_argument('--local', action='store_true',
+                   help="API 대신 sync-data로 저장한 데이터를 사용합니다.")
+    p.add_argument('--checkpoint', metavar='NAME',
+                   help="체크포인트 이름 (--local 필요). 저장된 상태에서 이어서 새 캔들만 계산합니다.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='tr_machine',
+        description="백테스트, 최적화, 검증, 분석, 봇 실행을 위한 통합 CLI",
+    )
+    parser.add_argument('--startup-time', action='store_true',
+                        help="서브커맨드를 실행하지 않고 필요한 모듈 로드 시간만 측정합니다.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('backtest', help="자체 백테스터 실행")
+    _add_backtest_arguments(p)
+    p.set_defaults(func=cmd_backtest, modules=_backtest_modules)
+
+    p = subparsers.add_parser('montecarlo', help="백테스트 결과의 몬테카를로 강건성 분석")
+    _add_backtest_arguments(p)
+    p.add_argument('--by', choices=['bar', 'trade'], default='bar',
+                   help="복원 추출 단위 (bar: 캔들별 수익률, trade: 거래별 수익률)")
+    p.add_argument('--paths', type=int, default=10_000, help="생성할 경로 수")
+    p.add_argument('--block', type=int, default=1, help="블록 부트스트랩 블록 길이 (1이면 일반 부트스트랩)")
+    p.add_argument('--ruin', type=float, default=0.5, help="파산으로 볼 자산 비율")
+    p.add_argument('--seed', type=int, default=None)
+    p.set_defaults(func=cmd_montecarlo, modules=_montecarlo_modules)
+
+    p = subparsers.add_parser('optimize', help="파라미터 최적화 실행")
+    p.add_argument('--target', choices=sorted(OPTIMIZE_SCRIPTS), default='ma',
+                   help="ma: 이동평균 조합, vb: 변동성 돌파 k값, gc-rsi: GC+RSI 파라미터")
+    p.add_argument('--search', choices=['grid', 'random', 'fast'], default='fast',
+                   help="gc-rsi 탐색 방식 (fast: 배열 엔진으로 전체 조합 후 상위 후보만 Backtest 재검증, "
+                        "grid: 전체 조합을 Backtest로 실행, random: 일부만 무작위로 평가, 최적값 보장 없음)")
+    p.add_argument('--samples', type=int, default=81, help="random 에서 평가할 후보 수")
+    p.add_argument('--verify', type=int, default=5, help="fast 에서 Backtest로 재검증할 상위 후보 수")
+    p.set_defaults(func=cmd_optimize, modules=_optimize_modules)
+
+    p = subparsers.add_parser('validate', help="backtesting.py 교차 검증 실행")
+    p.add_argument('--strategy', choices=sorted(VALIDATE_SCRIPTS), default='gc')
+    p.set_defaults(func=cmd_validate, modules=_validate_modules)
+
+    p = subparsers.add_parser('analyze', help="실시간 호가창 분석기 실행")
+    p.add_argument('--mode', choices=sorted(ANALYZE_SCRIPTS), default='basic')
+    p.add_argument('--ticker', default='KRW-BTC')
+    p.set_defaults(func=cmd_analyze, modules=_analyze_modules)
+
+    p = subparsers.add_parser('bot', help="모의 투자 봇 실행")
+    p.set_defaults(func=cmd_bot, modules=_bot_modules)
+
+    p = subparsers.add_parser('sync-data', help="OHLCV 데이터를 받아 로컬에 저장")
+    p.add_argument('tickers', nargs='*', default=['KRW-BTC'])
+    p.add_argument('--interval', default='day')
+    p.add_argument('--count', type=int, default=500, help="한 번에 받아올 캔들 개수")
+    p.set_defaults(func=cmd_sync_data, modules=_sync_data_modules)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.startup_time:
+        report_startup_time(args)
+    else:
+        args.func(args)
+    return 0
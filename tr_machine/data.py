@@ -0,0 +1,71 @@
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyupbit
+
+from tr_machine.ohlcv import OHLCV
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+
+def data_path(ticker, interval, data_dir=DATA_DIR):
+    """종목/캔들 단위별 CSV 파일 경로를 반환합니다."""
+    return Path(data_dir) / f"{ticker}_{interval}.csv"
+
+
+def compact_path(ticker, interval, data_dir=DATA_DIR):
+    """종목/캔들 단위별 OHLCV(.npz) 파일 경로를 반환합니다."""
+    return Path(data_dir) / f"{ticker}_{interval}.npz"
+
+
+def load_ohlcv(ticker, interval='day', data_dir=DATA_DIR):
+    """저장된 OHLCV 데이터를 불러옵니다. 파일이 없으면 None을 반환합니다."""
+    path = data_path(ticker, interval, data_dir)
+    if not path.exists():
+        return None
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def load_ohlcv_compact(ticker, interval='day', data_dir=DATA_DIR):
+    """
+    저장된 OHLCV 데이터를 tr_machine.ohlcv.OHLCV로 불러옵니다. 파일이 없으면 None을 반환합니다.
+    .npz 파일이 CSV보다 오래됐거나 없으면 CSV를 변환해 .npz를 새로 저장합니다.
+    """
+    path = data_path(ticker, interval, data_dir)
+    if not path.exists():
+        return None
+    npz = compact_path(ticker, interval, data_dir)
+    if npz.exists() and npz.stat().st_mtime >= path.stat().st_mtime:
+        return OHLCV.load(npz)
+
+    data = OHLCV.from_dataframe(load_ohlcv(ticker, interval, data_dir))
+    data.save(npz)
+    return data
+
+
+def sync_ohlcv(ticker, interval='day', count=500, data_dir=DATA_DIR):
+    """
+    최신 OHLCV 데이터를 받아 기존 파일에 이어붙여 저장합니다.
+    같은 시각의 캔들은 새로 받은 값으로 덮어씁니다.
+    """
+    print(f"📥 '{ticker}' ({interval}) 데이터 동기화 중...")
+    df_new = pyupbit.get_ohlcv(ticker, interval=interval, count=count)
+    if df_new is None:
+        print("❌ 데이터 로드 실패")
+        return None
+
+    df_old = load_ohlcv(ticker, interval, data_dir)
+    if df_old is not None:
+        df = pd.concat([df_old, df_new])
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+    else:
+        df = df_new
+
+    path = data_path(ticker, interval, data_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path)
+    OHLCV.from_dataframe(df).save(compact_path(ticker, interval, data_dir))
+    print(f"✅ {len(df):,}개 캔들 저장 완료: {path}")
+    time.sleep(0.1)  # API 호출 제한 방지
+    return df
@@ -0,0 +1,23 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sma(values, window):
+    """
+    단순 이동평균. 앞부분(window-1개)은 NaN입니다.
+
+    pandas의 rolling().mean()은 누적합을 이어가며 계산하므로 시작 위치에 따라 마지막 자리 값이
+    달라질 수 있습니다. 여기서는 각 구간의 값만으로 같은 순서로 더하므로, 데이터 일부만 가지고
+    이어서 계산해도 전체를 다시 계산한 결과와 비트 단위로 같습니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+
+    windows = sliding_window_view(values, window)
+    total = windows[:, 0].copy()
+    for k in range(1, window):
+        total += windows[:, k]
+    out[window - 1:] = total / window
+    return out
@@ -0,0 +1,121 @@
+"""
+여러 백테스트 결과(자산 곡선)의 성과 지표를 한 번에 계산하는 모듈.
+
+자산 곡선을 (실행 수 x 캔들 수) 2차원 배열로 받아 실행별 pandas 처리 없이
+CAGR, MDD, Sharpe/Sortino, Calmar, 시장 노출 비율, 거래 횟수, 승률, 평균 보유 기간을
+벡터 연산으로 계산합니다. 그리드/포트폴리오 탐색에서 수천 개의 결과를 정렬할 때 사용합니다.
+
+    metrics = compute_metrics(equity, positions, periods_per_year=365)
+    best = np.argsort(metrics['sharpe'])[::-1][:10]
+"""
+import numpy as np
+
+METRIC_NAMES = ('total_return', 'cagr', 'mdd', 'sharpe', 'sortino', 'calmar',
+                'exposure', 'n_trades', 'win_rate', 'avg_trade_bars')
+
+
+def _divide(a, b):
+    """0으로 나누는 경우 NaN을 반환하는 나눗셈"""
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    out = np.full(a.shape, np.nan)
+    np.divide(a, b, out=out, where=b != 0)
+    return out
+
+
+def _max_drawdown(equity):
+    peak = np.maximum.accumulate(equity, axis=1)
+    return ((equity - peak) / peak).min(axis=1)
+
+
+def _return_metrics(equity, periods_per_year):
+    returns = equity[:, 1:] / equity[:, :-1] - 1
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.full(len(equity), np.nan)
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean(axis=1))
+    scale = np.sqrt(periods_per_year)
+    return _divide(mean, std) * scale, _divide(mean, downside) * scale
+
+
+def _trade_metrics(equity, positions):
+    """
+    포지션 배열(캔들 종가 시점의 보유 여부)로 거래를 구분합니다.
+    거래 수익률은 진입 직전 캔들의 자산 대비 청산 캔들의 자산이며,
+    마지막까지 보유 중인 거래는 마지막 캔들 기준으로 평가합니다.
+    """
+    n_runs, n_bars = equity.shape
+    in_market = positions != 0
+    prev = np.zeros_like(in_market)
+    prev[:, 1:] = in_market[:, :-1]
+    entries = in_market & ~prev
+    exits = ~in_market & prev
+
+    # 진입 직전 캔들의 자산을 다음 진입 전까지 앞으로 채움
+    equity_before = np.empty_like(equity)
+    equity_before[:, 0] = equity[:, 0]
+    equity_before[:, 1:] = equity[:, :-1]
+    bar_index = np.where(entries, np.arange(n_bars), 0)
+    np.maximum.accumulate(bar_index, axis=1, out=bar_index)
+    entry_equity = np.take_along_axis(equity_before, bar_index, axis=1)
+
+    trade_returns = equity / entry_equity - 1
+    wins = (exits & (trade_returns > 0)).sum(axis=1)
+    wins += in_market[:, -1] & (trade_returns[:, -1] > 0)
+
+    n_trades = entries.sum(axis=1)
+    held_bars = in_market.sum(axis=1)
+    return {
+        'exposure': held_bars / n_bars,
+        'n_trades': n_trades,
+        'win_rate': _divide(wins, n_trades),
+        'avg_trade_bars': _divide(held_bars, n_trades),
+    }
+
+
+def compute_metrics(equity, positions=None, periods_per_year=365, chunk_size=None):
+    """
+    자산 곡선 배열의 성과 지표를 계산합니다.
+
+    equity: (실행 수, 캔들 수) 자산 곡선. 1차원이면 실행 1개로 취급합니다.
+    positions: equity와 같은 모양의 보유 수량/여부 배열 (0이면 미보유). 없으면 거래 관련 지표는 NaN.
+    periods_per_year: 연간 캔들 수 (일봉 365, 4시간봉 365*6)
+    chunk_size: 메모리 사용량을 제한하려면 한 번에 처리할 실행 수를 지정합니다.
+
+    지표 이름(METRIC_NAMES)을 키로, 실행별 값 배열을 값으로 하는 dict를 반환합니다.
+    MDD는 음수 비율(-0.2 = -20%)이며 평균 보유 기간은 캔들 수 단위입니다.
+    n_trades는 진입 횟수로 마지막까지 보유 중인 거래도 포함하며, 승률과 평균 보유 기간도 같은 거래 수로 나눕니다.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    if positions is not None:
+        positions = np.atleast_2d(np.asarray(positions))
+        if positions.shape != equity.shape:
+            raise ValueError(f"positions 모양 {positions.shape}이 equity 모양 {equity.shape}과 다릅니다.")
+
+    n_runs, n_bars = equity.shape
+    chunk_size = chunk_size or max(n_runs, 1)
+    results = {name: np.empty(n_runs) for name in METRIC_NAMES}
+
+    for start in range(0, n_runs, chunk_size):
+        rows = slice(start, start + chunk_size)
+        eq = equity[rows]
+
+        total_return = eq[:, -1] / eq[:, 0] - 1
+        years = (n_bars - 1) / periods_per_year
+        cagr = (eq[:, -1] / eq[:, 0]) ** (1 / years) - 1 if years > 0 else np.full(len(eq), np.nan)
+        mdd = _max_drawdown(eq)
+        sharpe, sortino = _return_metrics(eq, periods_per_year)
+
+        results['total_return'][rows] = total_return
+        results['cagr'][rows] = cagr
+        results['mdd'][rows] = mdd
+        results['sharpe'][rows] = sharpe
+        results['sortino'][rows] = sortino
+        results['calmar'][rows] = _divide(cagr, -mdd)
+
+        if positions is None:
+            for name in ('exposure', 'n_trades', 'win_rate', 'avg_trade_bars'):
+                results[name][rows] = np.nan
+        else:
+            for name, values in _trade_metrics(eq, positions[rows]).items():
+                results[name][rows] = values
+
+    return results
@@ -0,0 +1,120 @@
+"""
+부트스트랩 기반 몬테카를로 강건성 분석.
+
+백테스트 한 번의 결과는 과거에 실제로 일어난 하나의 경로일 뿐입니다.
+자체 백테스터의 캔들별 수익률(또는 거래별 수익률)을 복원 추출해 수천 개의 가상 경로를
+NumPy 배열로 만들고, 최종 수익률/MDD 분포와 파산 확률을 계산합니다.
+블록 부트스트랩(block_size > 1)은 연속된 수익률을 묶어서 뽑으므로 변동성 군집 같은
+시계열 특성을 어느 정도 유지합니다.
+
+    result = simulate_paths(returns_from_equity(results['equity']), n_paths=10_000, block_size=24)
+    print_report(result)
+"""
+import numpy as np
+
+# 한 번에 추출하는 (구간 x 경로) 배열의 최대 원소 수 (float64 기준 약 160MB)
+MAX_CHUNK_ELEMENTS = 20_000_000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def returns_from_equity(equity):
+    """자산 곡선에서 캔들별 수익률을 계산합니다."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[1:] / equity[:-1] - 1
+
+
+def trade_returns(equity, positions):
+    """
+    보유 구간별 거래 수익률을 계산합니다.
+    진입 직전 캔들의 자산 대비 청산 캔들의 자산이며, 마지막까지 보유 중인 거래는
+    마지막 캔들 기준으로 평가합니다. (tr_machine.metrics 의 거래 구분과 같은 기준)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    in_market = np.asarray(positions) != 0
+    prev = np.concatenate([[False], in_market[:-1]])
+    entries = np.flatnonzero(in_market & ~prev)
+    exits = np.flatnonzero(~in_market & prev)
+    if len(exits) < len(entries):
+        exits = np.append(exits, len(equity) - 1)
+    return equity[exits] / equity[np.maximum(entries - 1, 0)] - 1
+
+
+def _resample_indices(rng, n, n_steps, n_paths, block_size):
+    """(n_steps, n_paths) 크기의 복원 추출 인덱스. 블록은 끝에서 처음으로 이어집니다."""
+    if block_size <= 1:
+        return rng.integers(0, n, size=(n_steps, n_paths), dtype=np.int32)
+    n_blocks = -(-n_steps // block_size)
+    starts = rng.integers(0, n, size=(n_blocks, n_paths), dtype=np.int32)
+    offsets = np.arange(n_blocks * block_size, dtype=np.int32) % block_size
+    idx = (np.repeat(starts, block_size, axis=0) + offsets[:, None]) % n
+    return idx[:n_steps]
+
+
+def simulate_paths(returns, n_paths=10_000, n_steps=None, block_size=1, ruin_level=0.5,
+                   chunk_size=None, seed=None):
+    """
+    수익률을 복원 추출해 n_paths개의 경로를 만들고 경로별 결과를 계산합니다.
+
+    returns: 캔들별 또는 거래별 수익률 (0.01 = +1%)
+    n_steps: 경로 길이. 기본값은 원래 수익률 개수
+    block_size: 블록 부트스트랩의 블록 길이 (1이면 일반 부트스트랩)
+    ruin_level: 자산이 초기 자산의 이 비율 이하로 떨어지면 파산으로 간주
+    chunk_size: 한 번에 추출할 구간 길이(캔들 수). 기본값은 MAX_CHUNK_ELEMENTS 기준으로 자동 결정
+
+    경로 전체를 메모리에 두지 않고 구간 단위로 추출하면서 경로별 로그 자산, 최고점,
+    최대 낙폭, 최저점만 갱신하므로 메모리 사용량은 chunk_size x n_paths 로 제한됩니다.
+    {'final_return', 'mdd', 'ruined'} 경로별 배열과 'ruin_probability'를 담은 dict를 반환합니다.
+    """
+    log_returns = np.log1p(np.asarray(returns, dtype=np.float64))
+    n = len(log_returns)
+    if n == 0:
+        raise ValueError("수익률 데이터가 비어 있습니다.")
+    n_steps = n_steps or n
+    block_size = max(1, block_size)
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // n_paths)
+    # 블록이 구간 경계에서 잘리지 않도록 구간 길이를 블록 길이의 배수로 맞춤
+    chunk_size = -(-chunk_size // block_size) * block_size
+    rng = np.random.default_rng(seed)
+
+    # 경로별 상태 (로그 자산 기준, 초기 자산 = 0)
+    log_equity = np.zeros(n_paths)
+    peak = np.zeros(n_paths)
+    drawdown = np.zeros(n_paths)
+    low = np.zeros(n_paths)
+    tmp = np.empty(n_paths)
+
+    for start in range(0, n_steps, chunk_size):
+        steps = min(chunk_size, n_steps - start)
+        chunk = log_returns[_resample_indices(rng, n, steps, n_paths, block_size)]
+        # 한 캔들씩 모든 경로를 함께 갱신 (경로 벡터가 캐시에 머물러 2차원 누적 연산보다 빠름)
+        for row in chunk:
+            np.add(log_equity, row, out=log_equity)
+            np.maximum(peak, log_equity, out=peak)
+            np.subtract(log_equity, peak, out=tmp)
+            np.minimum(drawdown, tmp, out=drawdown)
+            np.minimum(low, log_equity, out=low)
+
+    ruined = low <= np.log(ruin_level)
+    return {
+        'final_return': np.expm1(log_equity),
+        'mdd': np.expm1(drawdown),
+        'ruined': ruined,
+        'ruin_probability': ruined.mean(),
+    }
+
+
+def print_report(result, ruin_level=0.5):
+    """simulate_paths 결과의 분포를 요약해 출력합니다."""
+    final_pct = np.percentile(result['final_return'], PERCENTILES) * 100
+    mdd_pct = np.percentile(result['mdd'], PERCENTILES) * 100
+
+    print("\n🎲 몬테카를로 강건성 분석 결과")
+    print("---------------------------------")
+    print(f"경로 수: {len(result['final_return']):,}개")
+    print("백분위    " + "  ".join(f"{p:>8}%" for p in PERCENTILES))
+    print("최종 수익률 " + "  ".join(f"{v:8.2f}%" for v in final_pct))
+    print("MDD       " + "  ".join(f"{v:8.2f}%" for v in mdd_pct))
+    print(f"손실 확률: {(result['final_return'] < 0).mean() * 100:.2f}%")
+    print(f"파산 확률 (자산 {ruin_level * 100:.0f}% 이하): {result['ruin_probability'] * 100:.2f}%")
+    print("---------------------------------")
@@ -0,0 +1,208 @@
+"""
+고정소수점 기반의 OHLCV 컨테이너.
+
+업비트 KRW 가격은 호가 단위의 배수이므로 float64 대신 정수 틱으로 저장할 수 있습니다.
+가격은 기준가(base)로부터의 int32 오프셋, 시간은 기준 시각으로부터의 int32 초 오프셋,
+거래량/거래대금은 float32로 저장해 pandas DataFrame 대비 메모리를 절반 이하로 줄입니다.
+
+- 가격과 시간은 `pyupbit.get_ohlcv` DataFrame과 비트 단위로 동일하게 복원됩니다.
+- 거래량(volume)과 거래대금(value)은 float32 정밀도(유효숫자 약 7자리)로 반올림됩니다.
+"""
+import numpy as np
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+MAX_PRICE_DECIMALS = 8
+NS_PER_SECOND = 1_000_000_000
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def _offset_dtype(offsets):
+    """오프셋이 int32 범위에 들어가면 int32, 아니면 int64를 사용합니다."""
+    if offsets.size == 0 or offsets.max() <= INT32_MAX:
+        return np.int32
+    return np.int64
+
+
+def _price_decimals(prices):
+    """모든 가격을 정수 틱으로 표현할 수 있는 최소 소수점 자릿수를 찾습니다."""
+    for decimals in range(MAX_PRICE_DECIMALS + 1):
+        scale = 10.0 ** decimals
+        ticks = np.rint(prices * scale)
+        if np.array_equal(ticks / scale, prices):
+            return decimals
+    raise ValueError(f"가격을 소수점 {MAX_PRICE_DECIMALS}자리 이내의 틱으로 표현할 수 없습니다.")
+
+
+class OHLCV:
+    """
+    배열 기반 OHLCV 컨테이너.
+
+    `OHLCV.from_dataframe(df)` 로 만들고, 자체 백테스터에는 `open`/`high`/`low`/`close`
+    (float64) 또는 `ticks('close')` (int64) 배열을 그대로 넘겨 사용합니다.
+    """
+    __slots__ = ('price_decimals', 'base_price', 'base_time', 'time_unit',
+                 '_time_offsets', '_price_offsets', 'volume', 'value', 'index_name')
+
+    def __init__(self, price_decimals, base_price, base_time, time_unit,
+                 time_offsets, price_offsets, volume, value=None, index_name=None):
+        self.price_decimals = int(price_decimals)
+        self.base_price = int(base_price)     # 가장 낮은 가격의 틱 값
+        self.base_time = int(base_time)       # 첫 캔들 시각 (epoch ns)
+        self.time_unit = int(time_unit)       # 시간 오프셋 단위 (ns)
+        self._time_offsets = time_offsets     # (n,) int32/int64
+        self._price_offsets = price_offsets   # (4, n) int32/int64, open/high/low/close 순
+        self.volume = volume                  # (n,) float32
+        self.value = value                    # (n,) float32 또는 None
+        self.index_name = index_name
+
+    # -------------------------------------------------------------------------
+    # DataFrame 변환
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_dataframe(cls, df):
+        """`pyupbit.get_ohlcv` 형식의 DataFrame을 변환합니다."""
+        if df.index.tz is not None:
+            raise ValueError("타임존이 지정된 인덱스는 지원하지 않습니다.")
+
+        prices = np.stack([df[col].to_numpy(dtype=np.float64) for col in PRICE_COLUMNS])
+        if not np.isfinite(prices).all():
+            raise ValueError("가격에 NaN 또는 무한대 값이 포함되어 있습니다.")
+
+        decimals = _price_decimals(prices)
+        ticks = np.rint(prices * 10.0 ** decimals).astype(np.int64)
+        base_price = int(ticks.min()) if ticks.size else 0
+        price_offsets = ticks - base_price
+        price_offsets = price_offsets.astype(_offset_dtype(price_offsets))
+
+        times = np.asarray(df.index, dtype='datetime64[ns]').view(np.int64)
+        base_time = int(times[0]) if len(times) else 0
+        time_offsets = times - base_time
+        # 업비트 캔들 시각은 초 단위이므로 대부분 int32 초 오프셋으로 저장됩니다.
+        time_unit = NS_PER_SECOND if not (time_offsets % NS_PER_SECOND).any() else 1
+        time_offsets = time_offsets // time_unit
+        time_offsets = time_offsets.astype(_offset_dtype(time_offsets))
+
+        volume = df['volume'].to_numpy(dtype=np.float32)
+        value = df['value'].to_numpy(dtype=np.float32) if 'value' in df.columns else None
+        return cls(decimals, base_price, base_time, time_unit,
+                   time_offsets, price_offsets, volume, value, df.index.name)
+
+    def to_dataframe(self):
+        """`pyupbit.get_ohlcv` 와 같은 형식의 DataFrame으로 복원합니다."""
+        import pandas as pd
+
+        columns = {name: self.prices(name) for name in PRICE_COLUMNS}
+        columns['volume'] = self.volume.astype(np.float64)
+        if self.value is not None:
+            columns['value'] = self.value.astype(np.float64)
+        index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]'), name=self.index_name)
+        return pd.DataFrame(columns, index=index)
+
+    # -------------------------------------------------------------------------
+    # 배열 접근
+    # -------------------------------------------------------------------------
+    @property
+    def timestamps(self):
+        """캔들 시각 (epoch ns, int64)"""
+        return self.base_time + self._time_offsets.astype(np.int64) * self.time_unit
+
+    def ticks(self, name):
+        """가격을 정수 틱(int64)으로 반환합니다. 1틱 = 10 ** -price_decimals 원"""
+        return self.base_price + self._price_offsets[PRICE_COLUMNS.index(name)].astype(np.int64)
+
+    def prices(self, name):
+        """가격을 원 단위 float64로 반환합니다."""
+        return self.ticks(name) / 10.0 ** self.price_decimals
+
+    @property
+    def open(self):
+        return self.prices('open')
+
+    @property
+    def high(self):
+        return self.prices('high')
+
+    @property
+    def low(self):
+        return self.prices('low')
+
+    @property
+    def close(self):
+        return self.prices('close')
+
+    def __len__(self):
+        return len(self._time_offsets)
+
+    def __getitem__(self, key):
+        """슬라이스로 일부 구간을 잘라냅니다. 배열은 복사하지 않고 뷰를 공유합니다."""
+        if not isinstance(key, slice):
+            raise TypeError("OHLCV는 슬라이스 인덱싱만 지원합니다.")
+        return OHLCV(self.price_decimals, self.base_price, self.base_time, self.time_unit,
+                     self._time_offsets[key], self._price_offsets[:, key], self.volume[key],
+                     None if self.value is None else self.value[key], self.index_name)
+
+    @property
+    def nbytes(self):
+        """배열이 차지하는 메모리 (bytes)"""
+        arrays = [self._time_offsets, self._price_offsets, self.volume]
+        if self.value is not None:
+            arrays.append(self.value)
+        return sum(a.nbytes for a in arrays)
+
+    # -------------------------------------------------------------------------
+    # 저장/불러오기
+    # -------------------------------------------------------------------------
+    def save(self, path):
+        """압축 없이 .npz 파일로 저장합니다. 인덱스 이름은 문자열 배열로 함께 저장합니다."""
+        arrays = {
+            'meta': np.array([self.price_decimals, self.base_price, self.base_time, self.time_unit],
+                             dtype=np.int64),
+            'time_offsets': self._time_offsets,
+            'price_offsets': self._price_offsets,
+            'volume': self.volume,
+        }
+        if self.value is not None:
+            arrays['value'] = self.value
+        if self.index_name is not None:
+            arrays['index_name'] = np.array(str(self.index_name))
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            decimals, base_price, base_time, time_unit = (int(v) for v in f['meta'])
+            value = f['value'] if 'value' in f.files else None
+            index_name = str(f['index_name']) if 'index_name' in f.files else None
+            return cls(decimals, base_price, base_time, time_unit,
+                       f['time_offsets'], f['price_offsets'], f['volume'], value, index_name)
+
+
+# -----------------------------------------------------------------------------
+# 자체 백테스터용 배열 변환
+# -----------------------------------------------------------------------------
+def bar_arrays(data, columns=PRICE_COLUMNS):
+    """
+    DataFrame 또는 OHLCV에서 캔들 시각('time', datetime64[ns])과 가격 배열(float64)을 꺼냅니다.
+    OHLCV는 DataFrame으로 복원하지 않고 필요한 가격 열만 배열로 만듭니다.
+    """
+    if isinstance(data, OHLCV):
+        bars = {'time': data.timestamps.view('datetime64[ns]')}
+        bars.update({name: data.prices(name) for name in columns})
+        return bars
+    bars = {'time': np.asarray(data.index, dtype='datetime64[ns]')}
+    bars.update({name: data[name].to_numpy(dtype=np.float64) for name in columns})
+    return bars
+
+
+def slice_bars(bars, start=None, stop=None):
+    """bar_arrays 결과의 모든 배열을 같은 구간으로 자릅니다."""
+    return {name: values[start:stop] for name, values in bars.items()}
+
+
+def find_bar(times, time):
+    """정렬된 캔들 시각 배열에서 time의 위치를 찾습니다. 없으면 None을 반환합니다."""
+    time = np.datetime64(time, 'ns')
+    i = int(np.searchsorted(times, time))
+    if i < len(times) and times[i] == time:
+        return i
+    return None
@@ -0,0 +1,234 @@
+"""
+backtesting.py 전략을 배열 연산으로 빠르게 실행하는 스크리닝 엔진.
+
+backtesting.py는 캔들마다 Strategy.next()를 호출하므로 수백 개 파라미터를 훑기에는 느립니다.
+여기서는 같은 Strategy 클래스의 init()을 그대로 실행해 self.I 지표를 NumPy 배열로 얻고,
+전략에 정의된 signals()로 진입/청산 신호 배열을 만든 뒤 backtesting.py와 같은 체결 규칙
+(다음 캔들 시가 체결, 자산 비율 주문의 정수 수량 내림, 진입/청산 양쪽 수수료)으로 자산 곡선을 계산합니다.
+
+전략 클래스에는 다음 두 가지가 필요합니다.
+
+- signals(): next()와 같은 규칙을 배열로 표현한 메서드로, (entries, exits) 불리언 배열을 반환합니다.
+  미보유 상태에서 entries가 참이면 매수하고, 보유 상태에서 exits가 참이면 전량 매도합니다.
+- order_size: 매수 주문 크기. next()에서도 self.buy(size=self.order_size)로 같은 값을 사용해야 합니다.
+  backtesting.py와 같이 1 미만이면 자산 비율, 1 이상이면 정수 수량입니다.
+최종 후보는 verify_with_backtest()로 실제 Backtest에 다시 돌려 결과가 같은지 확인합니다.
+
+    results = screen(GcRsiStrategy, df, param_candidates(), cash=100_000_000, commission=.0005)
+    best = np.argsort(results['final_equity'])[::-1][:5]
+    verify_with_backtest(GcRsiStrategy, df, [results['params'][i] for i in best], results=results)
+"""
+import numpy as np
+
+from tr_machine.metrics import compute_metrics
+
+# self.I()의 그리기 옵션 (배열 계산에는 쓰지 않음)
+PLOT_OPTIONS = ('name', 'plot', 'overlay', 'color')
+
+
+def crossover(series1, series2):
+    """
+    backtesting.lib.crossover의 배열 버전.
+    각 캔들에서 series1이 series2를 위로 돌파했는지를 불리언 배열로 반환합니다.
+    """
+    series1 = np.asarray(series1, dtype=np.float64)
+    series2 = np.asarray(series2, dtype=np.float64)
+    series1, series2 = np.broadcast_arrays(series1, series2)
+    out = np.zeros(series1.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        out[1:] = (series1[:-1] < series2[:-1]) & (series1[1:] > series2[1:])
+    return out
+
+
+class _Data:
+    """Strategy.init()에 넘길 전체 길이의 OHLCV 배열"""
+
+    def __init__(self, df):
+        self.df = df
+        self.index = df.index
+        for column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+            if column in df:
+                setattr(self, column, df[column].to_numpy(dtype=np.float64))
+
+    def __len__(self):
+        return len(self.index)
+
+
+def _indicator_key(func, args, kwargs):
+    """지표 캐시 키. 배열 인자는 같은 _Data를 공유하는 동안만 유효한 id로 구분합니다."""
+    args = tuple(('array', id(a)) if isinstance(a, np.ndarray) else a for a in args)
+    return func, args, tuple(sorted(kwargs.items()))
+
+
+def _check_strategy(strategy):
+    for name in ('signals', 'order_size'):
+        if not hasattr(strategy, name):
+            raise TypeError(f"{strategy.__name__}에 배열 엔진용 '{name}'이(가) 정의되어 있지 않습니다.")
+
+
+def _compile(strategy, data, params, cache=None):
+    indicators = []
+
+    def indicator(func, *args, scatter=False, **kwargs):
+        for option in PLOT_OPTIONS:
+            kwargs.pop(option, None)
+        key = _indicator_key(func, args, kwargs) if cache is not None else None
+        if key is not None and key in cache:
+            value = cache[key]
+        else:
+            value = np.asarray(func(*args, **kwargs), dtype=np.float64)
+            if key is not None:
+                cache[key] = value
+        if not scatter:
+            indicators.append(value)
+        return value
+
+    instance = object.__new__(strategy)
+    instance._data = data
+    instance.I = indicator
+    for name, value in params.items():
+        if not hasattr(strategy, name):
+            raise AttributeError(f"{strategy.__name__}에 '{name}' 파라미터가 없습니다.")
+        setattr(instance, name, value)
+    size = instance.order_size
+    if not (0 < size < 1 or (size >= 1 and size == int(size))):
+        raise ValueError(f"order_size는 1 미만의 자산 비율 또는 정수 수량이어야 합니다: {size}")
+    instance.init()
+
+    with np.errstate(invalid='ignore'):
+        entries, exits = instance.signals()
+    entries = np.array(entries, dtype=bool)
+    exits = np.array(exits, dtype=bool)
+
+    # backtesting.py의 지표 준비 구간: 처음으로 NaN이 아닌 위치 중 가장 늦은 것 + 1
+    warmup = max((int(np.isnan(value).argmin(axis=-1).max()) for value in indicators), default=0)
+    start = min(1 + warmup, len(data))
+    entries[:start] = False
+    exits[:start] = False
+    return entries, exits, size, start
+
+
+def compile_signals(strategy, df, **params):
+    """
+    strategy의 init()과 signals()를 배열로 실행합니다.
+    backtesting.py처럼 모든 지표가 계산되기 시작한 다음 캔들부터 신호를 인정하며,
+    (entries, exits), 주문 크기(order_size), 신호를 보기 시작하는 캔들 위치(start)를 반환합니다.
+    """
+    _check_strategy(strategy)
+    return _compile(strategy, _Data(df), params)
+
+
+def run_signals(df, entries, exits, size, cash=100_000_000, commission=.0005):
+    """
+    신호 배열로 롱 전용 모의 투자를 실행합니다.
+
+    신호가 나온 캔들의 다음 캔들 시가에 체결합니다. 매수 수량은 size가 1 미만이면 현금의
+    size 비율을 수수료 포함 가격으로 나눈 정수 수량, 1 이상이면 size 그대로입니다.
+    수량이 0이거나 현금이 부족하면 주문은 취소됩니다.
+    마지막 캔들의 신호는 체결되지 않으며, 보유 중인 거래는 마지막 종가로 평가만 합니다.
+    {'equity', 'position'} 캔들별 배열과 'n_closed_trades'(청산된 거래 수)를 담은 dict를 반환합니다.
+    """
+    opens = df['Open'].to_numpy(dtype=np.float64)
+    closes = df['Close'].to_numpy(dtype=np.float64)
+    n = len(closes)
+    entry_bars = np.flatnonzero(entries)
+    exit_bars = np.flatnonzero(exits)
+
+    equity = np.empty(n)
+    position = np.zeros(n)
+    n_closed_trades = 0
+    t = 0  # 미보유 상태로 신호를 확인할 첫 캔들
+    while True:
+        k = np.searchsorted(entry_bars, t)
+        if k == len(entry_bars) or entry_bars[k] + 1 >= n:
+            break
+        fill = entry_bars[k] + 1
+        equity[t:fill] = cash
+        price = opens[fill]
+        # backtesting.py _Broker._process_orders 와 같은 순서로 계산해야 결과가 비트 단위로 같음
+        price_plus_commission = price + (size * price * commission) / size
+        units = int((cash * size) // price_plus_commission) if size < 1 else int(size)
+        if not units or units * price_plus_commission > cash:
+            t = fill  # 주문 취소, 다음 캔들부터 다시 신호 확인
+            continue
+
+        cash -= units * price * commission
+        k = np.searchsorted(exit_bars, fill)
+        close_fill = exit_bars[k] + 1 if k < len(exit_bars) else n
+        held = slice(fill, min(close_fill, n))
+        equity[held] = cash + (closes[held] * units - units * price)
+        position[held] = units
+        if close_fill >= n:
+            t = n
+            break
+        exit_price = opens[close_fill]
+        cash += units * (exit_price - price) - units * exit_price * commission
+        n_closed_trades += 1
+        t = close_fill
+
+    equity[t:] = cash
+    return {'equity': equity, 'position': position, 'n_closed_trades': n_closed_trades}
+
+
+def screen(strategy, df, param_list, cash=100_000_000, commission=.0005, periods_per_year=365):
+    """
+    파라미터 목록을 모두 배열 엔진으로 실행하고 성과 지표를 한 번에 계산합니다.
+    파라미터가 같은 지표는 한 번만 계산해 후보 사이에 재사용합니다.
+    'params', 'equity'/'position' (실행 수 x 캔들 수), 'final_equity'와
+    tr_machine.metrics.compute_metrics 의 지표들을 담은 dict를 반환합니다.
+    'n_trades'는 compute_metrics와 같은 진입 횟수(보유 중인 거래 포함)이고,
+    backtesting.py의 '# Trades'와 같은 청산된 거래 수는 'n_closed_trades'에 담습니다.
+    """
+    _check_strategy(strategy)
+    param_list = list(param_list)
+    # 같은 (지표 함수, 기간) 조합은 한 번만 계산
+    data, cache = _Data(df), {}
+    equity = np.empty((len(param_list), len(df)))
+    position = np.empty((len(param_list), len(df)))
+    n_closed_trades = np.empty(len(param_list), dtype=np.int64)
+    for i, params in enumerate(param_list):
+        entries, exits, size, _ = _compile(strategy, data, params, cache)
+        run = run_signals(df, entries, exits, size, cash=cash, commission=commission)
+        equity[i], position[i] = run['equity'], run['position']
+        n_closed_trades[i] = run['n_closed_trades']
+
+    results = compute_metrics(equity, position, periods_per_year=periods_per_year)
+    results.update({'params': param_list, 'equity': equity, 'position': position,
+                    'final_equity': equity[:, -1], 'n_closed_trades': n_closed_trades})
+    return results
+
+
+def verify_with_backtest(strategy, df, param_list, results=None, cash=100_000_000,
+                         commission=.0005, rtol=1e-9):
+    """
+    선택한 파라미터를 실제 backtesting.py Backtest로 다시 실행해 배열 엔진 결과와 비교합니다.
+    results에 screen() 결과를 넘기면 그 값과, 없으면 새로 계산한 값과 비교합니다.
+    최종 자산과 거래 수가 모두 같으면 True를 반환합니다.
+    """
+    from backtesting import Backtest
+
+    fast = {}
+    if results is not None:
+        for i, params in enumerate(results['params']):
+            fast[tuple(sorted(params.items()))] = (results['final_equity'][i], results['n_closed_trades'][i])
+
+    bt = Backtest(df, strategy, cash=cash, commission=commission)
+    all_match = True
+    print("\n🔁 backtesting.py 재검증")
+    print("---------------------------------")
+    for params in param_list:
+        key = tuple(sorted(params.items()))
+        if key not in fast:
+            entries, exits, size, _ = compile_signals(strategy, df, **params)
+            run = run_signals(df, entries, exits, size, cash=cash, commission=commission)
+            fast[key] = (run['equity'][-1], run['n_closed_trades'])
+        fast_equity, fast_trades = fast[key]
+
+        stats = bt.run(**params)
+        match = (np.isclose(fast_equity, stats['Equity Final [$]'], rtol=rtol, atol=0)
+                 and fast_trades == stats['# Trades'])
+        all_match &= bool(match)
+        print(f"{'✅' if match else '❌'} {params} | 배열 엔진 {fast_equity:,.0f} ({fast_trades}회) "
+              f"/ Backtest {stats['Equity Final [$]']:,.0f} ({stats['# Trades']}회)")
+    print("---------------------------------")
+    return all_match